@@ -6,10 +6,16 @@ Compares all text versions, identifies artifacts, and generates detailed report
 
 import re
 import os
+import sys
 import json
-from difflib import SequenceMatcher, unified_diff
+from difflib import unified_diff
 from collections import defaultdict
 
+# Shared helpers live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from text_similarity import similarity
+from text_processing import load_file
+
 # Base paths
 BASE_DIR = "/Users/bonganimlambo/Documents/Code Development/Projects/Buddhist-Study-Materials/00-On Attaining Buddhism"
 EBOOK_DIR = os.path.join(BASE_DIR, "ebook pdf")
@@ -31,18 +37,6 @@ ARTIFACT_PATTERNS = [
     r'^\s*\d+\s*$',  # Standalone page numbers
 ]
 
-def load_file(filepath):
-    """Load file content with encoding fallback"""
-    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-    for encoding in encodings:
-        try:
-            with open(filepath, 'r', encoding=encoding) as f:
-                content = f.read()
-                return content
-        except (FileNotFoundError, UnicodeDecodeError):
-            continue
-    return None
-
 def remove_artifacts(text):
     """Remove printer artifacts from text"""
     cleaned = text
@@ -79,7 +73,7 @@ def split_by_chapters(text):
 
 def calculate_similarity(text1, text2):
     """Calculate similarity ratio between two texts"""
-    return SequenceMatcher(None, text1, text2).ratio()
+    return similarity(text1, text2)
 
 def find_differences(text1, text2, context=3):
     """Find specific differences between texts"""
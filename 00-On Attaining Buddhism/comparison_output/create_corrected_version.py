@@ -6,22 +6,17 @@ Removes artifacts, preserves chapter markers, generates detailed report
 
 import re
 import os
+import sys
 from datetime import datetime
 
+# Shared helpers live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from text_processing import load_file
+
 BASE_DIR = "/Users/bonganimlambo/Documents/Code Development/Projects/Buddhist-Study-Materials/00-On Attaining Buddhism"
 EBOOK_DIR = os.path.join(BASE_DIR, "ebook pdf")
 OUTPUT_DIR = os.path.join(BASE_DIR, "comparison_output")
 
-def load_file(filepath):
-    encodings = ['utf-8', 'latin-1', 'cp1252']
-    for enc in encodings:
-        try:
-            with open(filepath, 'r', encoding=enc) as f:
-                return f.read()
-        except:
-            continue
-    return None
-
 def identify_artifacts_with_lines(text):
     """Identify all artifacts with their line numbers"""
     artifacts = []
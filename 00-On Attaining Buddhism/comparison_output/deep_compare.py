@@ -5,23 +5,18 @@ Deep Text Comparison - Normalizes text for accurate comparison
 
 import re
 import os
+import sys
 import json
-from difflib import SequenceMatcher, unified_diff
+
+# Shared helpers live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from text_similarity import similarity
+from text_processing import load_file
 
 BASE_DIR = "/Users/bonganimlambo/Documents/Code Development/Projects/Buddhist-Study-Materials/00-On Attaining Buddhism"
 EBOOK_DIR = os.path.join(BASE_DIR, "ebook pdf")
 OUTPUT_DIR = os.path.join(BASE_DIR, "comparison_output")
 
-def load_file(filepath):
-    encodings = ['utf-8', 'latin-1', 'cp1252']
-    for enc in encodings:
-        try:
-            with open(filepath, 'r', encoding=enc) as f:
-                return f.read()
-        except:
-            continue
-    return None
-
 def normalize_text(text):
     """Normalize text for comparison - removes formatting differences"""
     # Remove printer artifacts
@@ -116,7 +111,7 @@ def main():
     print("\n=== NORMALIZED SIMILARITY WITH SHANNON BODIE ===")
     for name, text in [("Acrobat", norm_acrobat), ("PDF Extract", norm_pdf),
                        ("Final", norm_final), ("Validated", norm_validated)]:
-        sim = SequenceMatcher(None, norm_shannon, text).ratio()
+        sim = similarity(norm_shannon, text)
         print(f"  {name}: {sim:.2%}")
 
     # Word-level analysis
@@ -5,21 +5,16 @@ Final Cleanup Script - Handles all edge cases for On Attaining Buddhahood
 
 import re
 import os
+import sys
 from datetime import datetime
 
+# Shared helpers live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from text_processing import load_file
+
 BASE_DIR = "/Users/bonganimlambo/Documents/Code Development/Projects/Buddhist-Study-Materials/00-On Attaining Buddhism"
 OUTPUT_DIR = os.path.join(BASE_DIR, "comparison_output")
 
-def load_file(filepath):
-    encodings = ['utf-8', 'latin-1', 'cp1252']
-    for enc in encodings:
-        try:
-            with open(filepath, 'r', encoding=enc) as f:
-                return f.read()
-        except:
-            continue
-    return None
-
 def thorough_cleanup(text):
     """Remove all printer artifacts including embedded ones"""
     changes = []
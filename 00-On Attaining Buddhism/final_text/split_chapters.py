@@ -5,6 +5,11 @@ Split On Attaining Buddhahood into individual chapter files
 
 import re
 import os
+import sys
+
+# Shared helpers live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from text_processing import load_file
 
 BASE_DIR = "/Users/bonganimlambo/Documents/Code Development/Projects/Buddhist-Study-Materials/00-On Attaining Buddhism/final_text"
 
@@ -20,16 +25,6 @@ CHAPTER_TITLES = {
     "chapter_7": "Chapter 7 - Faith for Attaining Buddhahood in This Lifetime—Advance Unerringly Along the Great Path of the Oneness of Mentor and Disciple",
 }
 
-def load_file(filepath):
-    encodings = ['utf-8', 'latin-1', 'cp1252']
-    for enc in encodings:
-        try:
-            with open(filepath, 'r', encoding=enc) as f:
-                return f.read()
-        except:
-            continue
-    return None
-
 def split_into_chapters(text):
     """Split text by [Chapter X] markers"""
     chapters = {}
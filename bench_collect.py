@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for collect_chapters.py
+
+Starts a local HTTP stand-in for sokaglobal.org that serves synthetic
+chapter pages (with optional per-request latency), then runs the chapter
+collector against it with different concurrency settings, with the
+conditional-GET cache, and as a multi-book manifest crawl.
+"""
+
+import argparse
+import hashlib
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import collect_chapters
+
+
+BOOK_TEMPLATE = "{base_url}/book/{filename}"
+
+
+def synthetic_chapters(count: int) -> list:
+    """(filename, title) pairs for a synthetic book."""
+    return [(f"chapter-{i}.html", f"Chapter {i}") for i in range(1, count + 1)]
+
+
+def synthetic_index_html(count: int) -> bytes:
+    """Index page linking to `count` chapters, plus some unrelated links."""
+    links = "\n".join(f'<li><a href="chapter-{i}.html">Chapter&nbsp;{i}</a></li>'
+                      for i in range(1, count + 1))
+    html = f"""<!DOCTYPE html>
+<html><body>
+<nav><a href="/">Home</a> <a href="/about.html">About</a></nav>
+<main><ul>
+{links}
+</ul></main>
+</body></html>
+"""
+    return html.encode("utf-8")
+
+
+def synthetic_chapter_html(name: str, paragraphs: int = 12, nav_links: int = 1) -> bytes:
+    """Build a chapter page shaped like the real site's markup."""
+    body = "\n".join(
+        f"<p>Paragraph {i} of {name}. Nam-myoho-renge-kyo is the fundamental Law "
+        f"that permeates all phenomena in the universe.</p>"
+        for i in range(1, paragraphs + 1)
+    )
+    nav = "".join(f'<li><a href="/section-{i}.html">Section&nbsp;{i}</a></li>' for i in range(nav_links))
+    html = f"""<!DOCTYPE html>
+<html>
+<head><title>{name}</title><style>p {{ margin: 0 }}</style></head>
+<body>
+<header><nav><ul>{nav}</ul></nav></header>
+<main>
+<div class="field-item">
+<h1>{name}</h1>
+<script>var tracking = true;</script>
+{body}
+</div>
+</main>
+<footer>Soka Gakkai</footer>
+</body>
+</html>
+"""
+    return html.encode("utf-8")
+
+
+class ChapterStandIn:
+    """Local HTTP server standing in for the chapter site.
+
+    Every */index.html path returns an index page linking `chapters`
+    chapter pages; every other *.html path returns a synthetic chapter
+    page. Responses arrive after `latency` seconds; everything else is a
+    404. Pages carry an ETag and honour If-None-Match with 304 Not
+    Modified. Use as a context manager.
+    """
+
+    def __init__(self, latency: float = 0.0, chapters: int = 365, host: str = "127.0.0.1"):
+        self.latency = latency
+        self.chapters = chapters
+        self.requests = 0
+        self.not_modified = 0
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stand_in.lock:
+                    stand_in.requests += 1
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+                if not self.path.endswith(".html"):
+                    self.send_error(404)
+                    return
+                name = self.path.rsplit("/", 1)[-1]
+                if name == "index.html":
+                    payload = synthetic_index_html(stand_in.chapters)
+                else:
+                    payload = synthetic_chapter_html(name)
+                etag = '"%s"' % hashlib.sha256(payload).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    with stand_in.lock:
+                        stand_in.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_benchmark(chapters: int, latency: float, configs: list):
+    """Collect `chapters` pages from the stand-in once per (workers, per_host, rate) config."""
+    selected = synthetic_chapters(chapters)
+
+    print(f"Stand-in latency: {latency * 1000:.0f} ms, chapters: {len(selected)}")
+    print(f"{'workers':>8} {'per-host':>9} {'rate':>8} {'seconds':>9} {'pages/s':>9}")
+
+    with ChapterStandIn(latency=latency) as stand_in:
+        for workers, per_host, rate in configs:
+            with tempfile.TemporaryDirectory() as out_dir:
+                start = time.perf_counter()
+                ok, errors = collect_chapters.collect_chapters(
+                    selected, out_dir, BOOK_TEMPLATE, base_url=stand_in.base_url,
+                    workers=workers, per_host=per_host, rate=rate, burst=per_host,
+                    verbose=False)
+                elapsed = time.perf_counter() - start
+            rate_label = f"{rate:g}/s" if rate > 0 else "none"
+            print(f"{workers:>8} {per_host:>9} {rate_label:>8} {elapsed:>9.2f} {ok / elapsed:>9.1f}"
+                  + (f"  ({errors} errors)" if errors else ""))
+
+
+def run_cache_benchmark(chapters: int, latency: float, workers: int, per_host: int):
+    """Collect twice into the same directory: a cold run, then a conditional-GET run."""
+    selected = synthetic_chapters(chapters)
+
+    print(f"\nConditional-GET cache, {len(selected)} chapters, {workers} workers")
+    print(f"{'run':>8} {'seconds':>9} {'changed':>9} {'304s':>6}")
+
+    with ChapterStandIn(latency=latency) as stand_in, tempfile.TemporaryDirectory() as out_dir:
+        cache_path = f"{out_dir}/{collect_chapters.CACHE_FILENAME}"
+        for label in ("cold", "warm"):
+            cache = collect_chapters.ChapterCache(cache_path)
+            before = stand_in.not_modified
+            start = time.perf_counter()
+            collect_chapters.collect_chapters(
+                selected, out_dir, BOOK_TEMPLATE, base_url=stand_in.base_url,
+                workers=workers, per_host=per_host, rate=0, cache=cache, verbose=False)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>8} {elapsed:>9.2f} {len(cache.changed):>9} {stand_in.not_modified - before:>6}")
+
+
+def run_manifest_benchmark(books: int, chapters: int, latency: float, workers: int, per_host: int):
+    """Crawl several synthetic books, discovered from index pages, through one shared pool."""
+    manifest_books = [{
+        "id": f"book{b}",
+        "index_url": f"{{base_url}}/book{b}/index.html",
+        "url_template": f"{{base_url}}/book{b}/{{filename}}",
+        "chapter_pattern": rf"/book{b}/chapter-\d+\.html$",
+        "output_dir": f"book{b}",
+    } for b in range(1, books + 1)]
+
+    print(f"\nManifest crawl, {books} books x {chapters} chapters, {workers} shared workers")
+    with ChapterStandIn(latency=latency, chapters=chapters) as stand_in, \
+            tempfile.TemporaryDirectory() as out_dir:
+        fetcher = collect_chapters.Fetcher(per_host=per_host, rate=0)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            runs = collect_chapters.crawl(manifest_books, out_dir, fetcher, pool,
+                                          base_url=stand_in.base_url, use_cache=False,
+                                          verbose=False)
+        elapsed = time.perf_counter() - start
+        fetcher.close()
+
+    saved = sum(run.success_count for run in runs)
+    print(f"{'books':>8} {'pages':>7} {'seconds':>9} {'pages/s':>9}")
+    print(f"{len(runs):>8} {saved:>7} {elapsed:>9.2f} {saved / elapsed:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chapter collection against a local stand-in server")
+    parser.add_argument('--chapters', '-n', type=int, default=365,
+                        help='Number of chapters to collect per run (default: 365)')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Simulated server latency in seconds (default: 0.05)')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Token bucket rate for every run, 0 for unlimited (default: 0)')
+    args = parser.parse_args()
+
+    configs = [(1, 1, args.rate), (4, 4, args.rate), (8, 4, args.rate), (16, 8, args.rate)]
+    run_benchmark(args.chapters, args.latency, configs)
+    run_cache_benchmark(args.chapters, args.latency, workers=8, per_host=4)
+    run_manifest_benchmark(3, args.chapters // 3, args.latency, workers=8, per_host=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled OCR corrections against the one-rule-per-pass loops
+
+Times each pipeline in text_processing/rules.json applied the old way --
+one re.sub() or str.replace() over the whole text per entry -- and
+through CorrectionEngine, over the book's text files, and checks the two
+give the same text for every file.
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from text_processing import CorrectionEngine, entries, load_file, load_rules, rule_set
+from text_processing.rules import parse_flags
+
+DEFAULT_CORPUS = Path(__file__).parent / "00-On Attaining Buddhism" / "gemini extractions"
+
+
+def load_corpus(corpus_dir: Path) -> list:
+    """Read every *.txt file in a directory, as the cleanup scripts would."""
+    return [load_file(path) for path in sorted(corpus_dir.glob("*.txt"))]
+
+
+def one_pass_per_rule(pipeline: str):
+    """The pipeline applied the old way: str.replace() or re.sub() per entry."""
+    sets = load_rules()['sets']
+    steps = []
+    for name in load_rules()['pipelines'][pipeline]:
+        literal = sets[name].get('literal', False)
+        flags = parse_flags(sets[name].get('flags', ''))
+        steps.extend((literal, pattern, replacement, flags) for pattern, replacement in entries(name))
+
+    def apply(text: str) -> str:
+        for literal, pattern, replacement, flags in steps:
+            if literal:
+                text = text.replace(pattern, replacement)
+            else:
+                text = re.sub(pattern, replacement, text, flags=flags)
+        return text
+    return apply
+
+
+def best_time(func, texts: list, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [func(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def benchmark(texts: list, repeat: int = 3):
+    """Time every pipeline in the rules store both ways; best of `repeat` runs over the corpus."""
+    total_chars = sum(len(text) for text in texts)
+    print(f"Corpus: {len(texts)} files, {total_chars / 1024:,.0f} K characters")
+    print(f"{'pipeline':>10} {'rules':>6} {'passes':>7} {'loop s':>8} {'engine s':>9} {'speedup':>8} {'parity':>8}")
+
+    for pipeline in load_rules()['pipelines']:
+        rules = rule_set(pipeline)
+        start = time.perf_counter()
+        engine = CorrectionEngine(rules)
+        compile_time = time.perf_counter() - start
+
+        loop_time, reference = best_time(one_pass_per_rule(pipeline), texts, repeat)
+        engine_time, outputs = best_time(engine.apply, texts, repeat)
+        matches = sum(1 for got, want in zip(outputs, reference) if got == want)
+        print(f"{pipeline:>10} {len(rules):>6} {len(engine):>7} {loop_time:>8.3f} {engine_time:>9.3f} "
+              f"{loop_time / engine_time:>7.1f}x {matches:>4}/{len(texts)}")
+        print(f"{'':>10} compiled in {compile_time:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled OCR correction engine")
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS,
+                        help='Directory of book text files (*.txt) (default: the gemini extractions)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per method, best is reported (default: 3)')
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    if not texts:
+        print(f"No *.txt files found in {args.corpus}")
+        return
+    benchmark(texts, repeat=args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark the chapter content extraction backends in html_extract.py
+
+Runs every available backend over a corpus of saved HTML pages and
+reports pages per second, checking each backend's output against the
+original BeautifulSoup extraction. Without --corpus, a synthetic corpus
+shaped like the real chapter pages is generated.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import html_extract
+from bench_collect import synthetic_chapter_html
+
+
+def synthetic_corpus(pages: int) -> list:
+    """Chapter pages with site-sized navigation and varied content length."""
+    return [
+        synthetic_chapter_html(f"chapter-{i}.html", paragraphs=20 + i % 40, nav_links=200)
+        for i in range(pages)
+    ]
+
+
+def load_corpus(corpus_dir: Path) -> list:
+    """Read every saved *.html page in a directory."""
+    return [path.read_bytes() for path in sorted(corpus_dir.glob("*.html"))]
+
+
+def benchmark(pages: list, repeat: int = 3):
+    """Time each backend; best of `repeat` runs over the whole corpus."""
+    backends = html_extract.available_extractors()
+    reference = None
+    if html_extract.BS4_AVAILABLE:
+        reference = [html_extract.extract_chapter_text(page, 'soup') for page in pages]
+
+    total_bytes = sum(len(page) for page in pages)
+    print(f"Corpus: {len(pages)} pages, {total_bytes / 1024:,.0f} KB")
+    print(f"{'backend':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8} {'parity':>8}")
+
+    baseline = None
+    for backend in ['soup'] + [b for b in backends if b != 'soup']:
+        if backend not in backends:
+            continue
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs = [html_extract.extract_chapter_text(page, backend) for page in pages]
+            best = min(best, time.perf_counter() - start)
+        baseline = baseline or best
+
+        if reference is None:
+            parity = "n/a"
+        else:
+            matches = sum(1 for got, want in zip(outputs, reference) if got == want)
+            parity = f"{matches}/{len(pages)}"
+        print(f"{backend:>8} {best:>9.3f} {len(pages) / best:>9.1f} {baseline / best:>7.1f}x {parity:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML content extraction backends")
+    parser.add_argument('--corpus', type=Path,
+                        help='Directory of saved chapter pages (*.html); synthetic pages if omitted')
+    parser.add_argument('--pages', '-n', type=int, default=365,
+                        help='Synthetic corpus size (default: 365)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per backend, best is reported (default: 3)')
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.pages)
+    if not pages:
+        print(f"No *.html pages found in {args.corpus}")
+        return
+    benchmark(pages, repeat=args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the OCR stages in ocr_book.py
+
+Builds a synthetic PDF of single-column and two-column pages whose text
+is known, then times each stage -- page rendering (streamed and
+pdf_to_images), layout detection, Tesseract and Surya -- once per
+configuration (DPI, PSM, Surya batch size). Every configuration runs in
+a fresh process so its peak RSS is its own. Reports pages per second,
+peak RSS and, for the OCR stages, character error rate against the
+ground truth (layout detection reports how many pages it labelled
+right). Tesseract is skipped when its binary is missing, Surya when it
+is not installed.
+"""
+
+import io
+import sys
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792   # US Letter, points
+MARGIN = 72
+GUTTER = 36
+HEADING_HEIGHT = 40
+FONT_SIZE = 11
+
+VOCABULARY = """
+the of and to in that is life Buddhism Law practice faith Nichiren Daishonin
+compassion wisdom courage happiness peace mentor disciple prayer daimoku Lotus
+Sutra Buddha nature human revolution dialogue friendship hope struggle victory
+earnest sincere determination world transform karma dignity respect value
+create joy each every person society future youth bodhisattva earth ten worlds
+""".split()
+
+
+def synthetic_paragraphs(rng: random.Random, words: int) -> str:
+    """About `words` words of sentence-shaped text in short paragraphs."""
+    paragraphs = []
+    while words > 0:
+        sentences = []
+        for _ in range(rng.randint(2, 4)):
+            length = rng.randint(6, 14)
+            sentence = ' '.join(rng.choice(VOCABULARY) for _ in range(length))
+            sentences.append(sentence[0].upper() + sentence[1:] + '.')
+            words -= length
+        paragraphs.append(' '.join(sentences))
+    return '\n'.join(paragraphs)
+
+
+def fill_box(page, rect, rng: random.Random) -> str:
+    """Put as much synthetic text into `rect` as fits; return the text placed."""
+    words = int(rect.width * rect.height / 90)
+    while words > 0:
+        text = synthetic_paragraphs(rng, words)
+        # insert_textbox writes nothing when the text overflows the box
+        if page.insert_textbox(rect, text, fontsize=FONT_SIZE, fontname='helv') >= 0:
+            return text
+        words = int(words * 0.9)
+    return ''
+
+
+def build_pdf(path: Path, pages: int, seed: int = 0) -> tuple:
+    """Write alternating single- and two-column pages to `path`.
+
+    Returns (ground-truth text per page, expected layout per page). Text
+    is in reading order: heading, then the left column, then the right.
+    """
+    rng = random.Random(seed)
+    doc = fitz.open()
+    truth, layouts = [], []
+    for index in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        heading = f"Chapter {index + 1}"
+        page.insert_textbox(fitz.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, MARGIN + HEADING_HEIGHT),
+                            heading, fontsize=18, fontname='helv')
+        top = MARGIN + HEADING_HEIGHT
+        bottom = PAGE_HEIGHT - MARGIN
+        if index % 2 == 0:
+            layouts.append('single')
+            body = [fill_box(page, fitz.Rect(MARGIN, top, PAGE_WIDTH - MARGIN, bottom), rng)]
+        else:
+            layouts.append('double')
+            middle = PAGE_WIDTH / 2
+            body = [fill_box(page, fitz.Rect(MARGIN, top, middle - GUTTER / 2, bottom), rng),
+                    fill_box(page, fitz.Rect(middle + GUTTER / 2, top, PAGE_WIDTH - MARGIN, bottom), rng)]
+        truth.append('\n'.join([heading] + body))
+    doc.save(str(path))
+    doc.close()
+    return truth, layouts
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance between two strings.
+
+    Bit-parallel (Myers/Hyyrö): one pass over `b`, with a column of the
+    DP table for `a` packed into Python ints, so whole pages compare in
+    milliseconds.
+    """
+    if not a:
+        return len(b)
+    m = len(a)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    peq = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    pv, mv, score = full, 0, m
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+def normalized(text: str) -> str:
+    """Whitespace collapsed, so line breaks and column joins are not errors."""
+    return ' '.join(text.split())
+
+
+def character_error_rate(truth: list, texts: list) -> float:
+    """Edit distance over all pages divided by the ground-truth length."""
+    errors = sum(levenshtein(normalized(want), normalized(got)) for want, got in zip(truth, texts))
+    return errors / max(1, sum(len(normalized(want)) for want in truth))
+
+
+def peak_rss_mb():
+    """This process's peak resident set size in MB, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_stage(stage: str, pdf_path: str, params: dict, truth: list, layouts: list) -> dict:
+    """Run one stage over the whole PDF; returns {'pages', 'seconds', 'rss', 'quality'}.
+
+    Only the stage itself is timed: pages an OCR stage needs are rendered
+    outside the clock, one at a time. Model loading is not timed either,
+    but stays in the peak RSS.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        import ocr_book
+
+        dpi = params.get('dpi', 300)
+        seconds = 0.0
+        quality = None
+        if stage == 'render':
+            start = time.perf_counter()
+            pages = sum(1 for _ in ocr_book.iter_page_images(pdf_path, dpi))
+            seconds = time.perf_counter() - start
+        elif stage == 'pdf_to_images':
+            start = time.perf_counter()
+            pages = len(ocr_book.pdf_to_images(pdf_path, dpi))
+            seconds = time.perf_counter() - start
+        elif stage == 'layout':
+            labels = []
+            for _, img in ocr_book.iter_page_images(pdf_path, dpi):
+                start = time.perf_counter()
+                labels.append(ocr_book.detect_layout(img))
+                seconds += time.perf_counter() - start
+            pages = len(labels)
+            quality = f"{sum(got == want for got, want in zip(labels, layouts))}/{pages} ok"
+        elif stage == 'tesseract':
+            texts = []
+            for _, img in ocr_book.iter_page_images(pdf_path, dpi):
+                start = time.perf_counter()
+                texts.append(ocr_book.tesseract_entry(img, psm=params['psm'], dpi=dpi)['text'])
+                seconds += time.perf_counter() - start
+            pages = len(texts)
+            quality = f"CER {character_error_rate(truth, texts):.2%}"
+        elif stage == 'surya':
+            models = ocr_book.load_surya_models()
+            texts = []
+            for _, img in ocr_book.iter_page_images(pdf_path, dpi):
+                # Column crops, as process_pdf() sends them
+                crops = [crop for crop, _ in ocr_book.crop_regions(img, ocr_book.analyze_layout(img))]
+                start = time.perf_counter()
+                region_texts = ocr_book.ocr_with_surya(crops, models, batch_size=params['batch_size'])
+                seconds += time.perf_counter() - start
+                texts.append(ocr_book.join_regions(region_texts))
+            pages = len(texts)
+            quality = f"CER {character_error_rate(truth, texts):.2%}"
+        else:
+            raise ValueError(f"Unknown stage: {stage}")
+
+    return {'pages': pages, 'seconds': seconds, 'rss': peak_rss_mb(), 'quality': quality}
+
+
+def run_isolated(*args) -> dict:
+    """run_stage() in a fresh interpreter, so peak RSS covers only that run."""
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run_stage, args)
+
+
+def tesseract_available() -> bool:
+    import pytesseract
+    try:
+        pytesseract.get_tesseract_version()
+        return True
+    except (pytesseract.TesseractNotFoundError, OSError):
+        return False
+
+
+def surya_available() -> bool:
+    with contextlib.redirect_stdout(io.StringIO()):
+        import ocr_book
+    return ocr_book.SURYA_AVAILABLE
+
+
+def configurations(stages: list, dpis: list, psms: list, batch_sizes: list, ocr_dpi: int) -> list:
+    """(stage, label, params) for every run, in report order."""
+    configs = []
+    for stage in ('render', 'pdf_to_images', 'layout'):
+        if stage in stages:
+            configs += [(stage, f"dpi={dpi}", {'dpi': dpi}) for dpi in dpis]
+    if 'tesseract' in stages:
+        configs += [('tesseract', f"dpi={dpi} psm={psm}", {'dpi': dpi, 'psm': psm})
+                    for dpi in dpis for psm in psms]
+    if 'surya' in stages:
+        configs += [('surya', f"dpi={ocr_dpi} batch={size}", {'dpi': ocr_dpi, 'batch_size': size})
+                    for size in batch_sizes]
+    return configs
+
+
+def benchmark(pdf_path: Path, truth: list, layouts: list, configs: list):
+    print(f"Synthetic PDF: {len(truth)} pages ({layouts.count('single')} single, "
+          f"{layouts.count('double')} two-column), {sum(map(len, truth)):,} characters")
+    print(f"{'stage':>14} {'config':>18} {'seconds':>9} {'pages/s':>9} {'peak MB':>9}  quality")
+    for stage, label, params in configs:
+        result = run_isolated(stage, str(pdf_path), params, truth, layouts)
+        rate = result['pages'] / result['seconds'] if result['seconds'] else float('inf')
+        rss = f"{result['rss']:.0f}" if result['rss'] is not None else "n/a"
+        print(f"{stage:>14} {label:>18} {result['seconds']:>9.2f} {rate:>9.1f} {rss:>9}  "
+              f"{result['quality'] or ''}")
+
+
+def int_list(value: str) -> list:
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main():
+    stages = ['render', 'pdf_to_images', 'layout', 'tesseract', 'surya']
+    parser = argparse.ArgumentParser(description="Benchmark OCR stages on synthetic PDF pages")
+    parser.add_argument('--pages', '-n', type=int, default=8,
+                        help='Synthetic pages, alternating single and two-column (default: 8)')
+    parser.add_argument('--dpi', type=int_list, default=[150, 200, 300],
+                        help='Comma-separated render DPIs (default: 150,200,300)')
+    parser.add_argument('--psm', type=int_list, default=[3, 4, 6],
+                        help='Comma-separated Tesseract PSM modes (default: 3,4,6)')
+    parser.add_argument('--batch-size', type=int_list, default=[1, 4, 8],
+                        help='Comma-separated Surya batch sizes (default: 1,4,8)')
+    parser.add_argument('--ocr-dpi', type=int, default=300,
+                        help='Render DPI for the Surya runs (default: 300)')
+    parser.add_argument('--stages', type=lambda v: v.split(','), default=stages,
+                        help=f"Comma-separated stages to run (default: {','.join(stages)})")
+    parser.add_argument('--keep', type=Path,
+                        help='Save the synthetic PDF here instead of a temporary file')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for the synthetic text (default: 0)')
+    args = parser.parse_args()
+
+    unknown = set(args.stages) - set(stages)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    selected = list(args.stages)
+    if 'tesseract' in selected and not tesseract_available():
+        print("Skipping tesseract: binary not found")
+        selected.remove('tesseract')
+    if 'surya' in selected and not surya_available():
+        print("Skipping surya: not installed")
+        selected.remove('surya')
+
+    configs = configurations(selected, args.dpi, args.psm, args.batch_size, args.ocr_dpi)
+    if args.keep:
+        truth, layouts = build_pdf(args.keep, args.pages, args.seed)
+        benchmark(args.keep, truth, layouts, configs)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "synthetic.pdf"
+            truth, layouts = build_pdf(pdf_path, args.pages, args.seed)
+            benchmark(pdf_path, truth, layouts, configs)
+
+
+if __name__ == '__main__':
+    main()
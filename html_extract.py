@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Chapter content extraction backends for collect_chapters.py
+
+Every backend finds the chapter body the same way the original
+BeautifulSoup code did -- the first <div class="field-item">, else the
+first <article>, else the first <main> -- drops script, style, nav,
+header and footer elements inside it, and returns its text through
+clean_text(). Backends differ only in speed:
+
+- stream: single-pass event parser on the standard library's HTMLParser;
+          stops as soon as the content container closes (default)
+- lxml:   lxml.html tree, if lxml is installed
+- soup:   the original BeautifulSoup(..., 'html.parser') tree walk
+"""
+
+import re
+import codecs
+from html.entities import html5
+from html.parser import HTMLParser
+
+BS4_AVAILABLE = False
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    pass
+
+LXML_AVAILABLE = False
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    pass
+
+DEFAULT_EXTRACTOR = "stream"
+
+# Elements removed from the content container before taking its text
+REMOVED_TAGS = {"script", "style", "nav", "header", "footer"}
+
+# Strings directly inside these elements are left out of get_text() by BeautifulSoup
+HIDDEN_STRING_TAGS = {"script", "style", "template", "rt", "rp"}
+
+# Elements that never have an end tag
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr",
+    "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+}
+
+# Container candidates in order of preference
+CANDIDATES = ("field-item", "article", "main")
+
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+
+def clean_text(text):
+    """Clean and format text content"""
+    # Remove extra whitespace
+    lines = text.split('\n')
+    cleaned_lines = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            cleaned_lines.append(line)
+    return '\n\n'.join(cleaned_lines)
+
+
+def decode_html(content):
+    """Decode page bytes: BOM, then declared charset, then UTF-8, then Windows-1252"""
+    if isinstance(content, str):
+        return content
+    for bom, encoding in ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'),
+                          (codecs.BOM_UTF16_BE, 'utf-16-be')):
+        if content.startswith(bom):
+            return content[len(bom):].decode(encoding, errors='replace')
+
+    declared = META_CHARSET.search(content)
+    encodings = [declared.group(1).decode('ascii').lower()] if declared else []
+    for encoding in encodings + ['utf-8']:
+        try:
+            return content.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return content.decode('windows-1252', errors='replace')
+
+
+def _is_field_item(attrs):
+    for name, value in attrs:
+        if name == 'class' and value and ('field-item' in value.split() or value == 'field-item'):
+            return True
+    return False
+
+
+class _ContainerFound(Exception):
+    pass
+
+
+def _entity_table():
+    """Named references without their semicolons, as BeautifulSoup resolves them"""
+    table = {}
+    for name, character in sorted(html5.items()):
+        table.setdefault(name.rstrip(';'), character)
+    return table
+
+
+ENTITIES = _entity_table()
+NUMERIC_REFERENCE = {10: re.compile(r'^([0-9]+)(.*)'), 16: re.compile(r'^([0-9a-f]+)(.*)')}
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+def _numeric_reference(number):
+    """Resolve a numeric character reference following the HTML spec"""
+    if number == 0 or number > 0x10ffff or 0xd800 <= number <= 0xdfff:
+        return '\ufffd'
+    if 0x80 <= number <= 0x9f:
+        try:
+            return bytes([number]).decode('windows-1252')
+        except UnicodeDecodeError:
+            pass
+    return chr(number)
+
+
+class _StreamExtractor(HTMLParser):
+    """Collects the text of the first container of each candidate kind.
+
+    Mirrors how BeautifulSoup's html.parser builder shapes the tree and
+    its strings: void elements are never pushed, an end tag closes the
+    most recent open element with that name along with everything opened
+    after it, character data between two markup events forms one string,
+    and whitespace-only strings collapse to a single newline or space.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.stack = []
+        self.removed_depths = []
+        self.hidden_depths = []
+        self.preserve_depths = []
+        self.pending = []
+        # kind -> [stack depth, removed-element count at open, text chunks, closed]
+        self.captures = {}
+
+    def flush(self, always_visible=False):
+        """End the current string and hand it to every open capture"""
+        if not self.pending:
+            return
+        data = ''.join(self.pending)
+        self.pending = []
+        if not self.preserve_depths and not data.strip(ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+        if self.hidden_depths and not always_visible:
+            return
+        removed = len(self.removed_depths)
+        for depth, removed_at_open, chunks, closed in self.captures.values():
+            if not closed and removed == removed_at_open:
+                chunks.append(data)
+
+    def handle_starttag(self, tag, attrs):
+        self.flush()
+        if tag in VOID_TAGS:
+            return
+        self.stack.append(tag)
+        depth = len(self.stack)
+
+        kind = None
+        if tag == 'div' and 'field-item' not in self.captures and _is_field_item(attrs):
+            kind = 'field-item'
+        elif tag in ('article', 'main') and tag not in self.captures:
+            kind = tag
+        if kind:
+            self.captures[kind] = [depth, len(self.removed_depths), [], False]
+
+        if tag in REMOVED_TAGS:
+            self.removed_depths.append(depth)
+        if tag in HIDDEN_STRING_TAGS:
+            self.hidden_depths.append(depth)
+        if tag in ('pre', 'textarea'):
+            self.preserve_depths.append(depth)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self.flush()
+        if tag not in self.stack:
+            return
+        index = len(self.stack) - 1 - self.stack[::-1].index(tag)
+        del self.stack[index:]
+        depth = len(self.stack)
+
+        for depths in (self.removed_depths, self.hidden_depths, self.preserve_depths):
+            while depths and depths[-1] > depth:
+                depths.pop()
+        for kind, capture in self.captures.items():
+            if not capture[3] and capture[0] > depth:
+                capture[3] = True
+                if kind == 'field-item':
+                    raise _ContainerFound()
+
+    def handle_data(self, data):
+        self.pending.append(data)
+
+    def handle_entityref(self, name):
+        self.pending.append(ENTITIES.get(name, '&' + name))
+
+    def handle_charref(self, name):
+        base = 16 if name[:1] in ('x', 'X') else 10
+        digits = name[1:] if base == 16 else name
+        extra = ''
+        try:
+            number = int(digits, base)
+        except ValueError:
+            match = NUMERIC_REFERENCE[base].search(digits)
+            if match is None:
+                self.pending.append(digits)
+                return
+            number, extra = int(match.group(1), base), match.group(2)
+        self.pending.append(_numeric_reference(number) + extra)
+
+    def handle_comment(self, data):
+        self.flush()
+
+    def handle_decl(self, decl):
+        self.flush()
+
+    def handle_pi(self, data):
+        self.flush()
+
+    def unknown_decl(self, data):
+        self.flush()
+        if data.upper().startswith('CDATA['):
+            # CDATA sections stay visible to get_text() wherever they appear
+            self.pending.append(data[len('CDATA['):])
+            self.flush(always_visible=True)
+
+    def close(self):
+        super().close()
+        self.flush()
+
+    def text(self):
+        for kind in CANDIDATES:
+            if kind in self.captures:
+                return ''.join(self.captures[kind][2])
+        return None
+
+
+def extract_stream(content):
+    """Single-pass extraction; stops parsing once the field-item div closes"""
+    parser = _StreamExtractor()
+    try:
+        parser.feed(decode_html(content))
+        parser.close()
+    except _ContainerFound:
+        pass
+    text = parser.text()
+    return clean_text(text) if text is not None else None
+
+
+def extract_soup(content):
+    """Original extraction: BeautifulSoup tree with html.parser"""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    # Find the main content area
+    content = soup.find('div', class_='field-item')
+    if not content:
+        content = soup.find('article')
+    if not content:
+        content = soup.find('main')
+
+    if not content:
+        return None
+
+    # Remove script and style elements
+    for script in content(list(REMOVED_TAGS)):
+        script.decompose()
+    return clean_text(content.get_text())
+
+
+def _lxml_strings(element, hidden=False):
+    def visible(data):
+        if not data.strip(ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+        return data
+
+    hidden = hidden or element.tag in HIDDEN_STRING_TAGS
+    if element.text and not hidden:
+        yield visible(element.text)
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in REMOVED_TAGS:
+            yield from _lxml_strings(child, hidden)
+        if child.tail and not hidden:
+            yield visible(child.tail)
+
+
+def extract_lxml(content):
+    """lxml.html tree; libxml2 may repair badly nested markup differently from html.parser"""
+    root = lxml.html.fromstring(content)
+    for query in ('//div[contains(concat(" ", normalize-space(@class), " "), " field-item ")]',
+                  '//article', '//main'):
+        found = root.xpath(f'({query})[1]')
+        if found:
+            hidden = any(parent.tag in HIDDEN_STRING_TAGS for parent in found[0].iterancestors())
+            return clean_text(''.join(_lxml_strings(found[0], hidden)))
+    return None
+
+
+class _LinkCollector(HTMLParser):
+    """Collects (href, link text) for every <a href> in a page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            self.current = [href, []] if href else None
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self.current:
+            self.links.append((self.current[0], ' '.join(''.join(self.current[1]).split())))
+            self.current = None
+
+    def handle_data(self, data):
+        if self.current:
+            self.current[1].append(data)
+
+
+def extract_links(content):
+    """Return (href, text) for every link on a page, in document order"""
+    parser = _LinkCollector()
+    parser.feed(decode_html(content))
+    parser.close()
+    return parser.links
+
+
+EXTRACTORS = {
+    'stream': extract_stream,
+    'lxml': extract_lxml,
+    'soup': extract_soup,
+}
+
+
+def available_extractors():
+    """Names of the backends usable in this environment"""
+    names = ['stream']
+    if LXML_AVAILABLE:
+        names.append('lxml')
+    if BS4_AVAILABLE:
+        names.append('soup')
+    return names
+
+
+def extract_chapter_text(content, extractor=DEFAULT_EXTRACTOR):
+    """Return the cleaned chapter text from page bytes, or None if no content container"""
+    if extractor not in available_extractors():
+        raise ValueError(f"Extractor '{extractor}' not available (have: {', '.join(available_extractors())})")
+    return EXTRACTORS[extractor](content)
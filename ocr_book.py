@@ -7,18 +7,30 @@ Uses Surya OCR (best for complex layouts) with Tesseract as fallback.
 """
 
 import os
+import re
 import sys
+import json
+import time
+import hashlib
 import argparse
+from itertools import repeat
+from functools import lru_cache
+from importlib import metadata
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 # PDF processing
 import fitz  # PyMuPDF
+import numpy as np
 from PIL import Image
-import io
 
 # OCR engines
 import pytesseract
+from pytesseract import Output
+
+from ocr_fusion import fuse_page
+from ocr_pages import PageRecordWriter
 
 # Surya OCR (v0.17+ API)
 SURYA_AVAILABLE = False
@@ -30,37 +42,92 @@ try:
 except ImportError:
     print("Note: Surya OCR not fully available, will use Tesseract")
 
+PSUTIL_AVAILABLE = False
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    pass
+
+
+SURYA_BATCH_SIZE = 4          # used when available RAM cannot be read
+SURYA_MAX_BATCH = 32
+SURYA_MB_PER_IMAGE = 400      # rough working set per 300 DPI page image
+SURYA_RAM_SHARE = 0.5         # share of available RAM batches may use
+
+# Bump when cropping or text assembly changes what a cached page holds
+OCR_CACHE_VERSION = 4
+CACHE_DIRNAME = ".ocr_cache"
+
+# Per-page strategy (--strategy auto): a usable text layer first, then OCR
+# from the lowest DPI up, escalating while recognition confidence is low
+TEXT_LAYER = 'text layer'
+DPI_STEPS = (150, 200, 300, 400, 600)
+DEFAULT_MIN_DPI = 200
+MIN_CONFIDENCE = 75.0          # mean line confidence, 0-100
+MIN_TEXT_LAYER_CHARS = 20
+MIN_WORDLIKE_SHARE = 0.7
+MAX_BAD_CHAR_SHARE = 0.01
+WORDLIKE = re.compile(r"[\"'(\[“‘]*(?:[^\W\d_]+(?:[-'’][^\W\d_]+)*|\d+(?:[.,:]\d+)*)[\"')\].,;:!?”’]*")
+BAD_CHARS = re.compile(r"[\ufffd\x00-\x08\x0b\x0c\x0e-\x1f\ue000-\uf8ff]")
+
+# Largest page range handed to one worker process at a time
+MAX_RANGE_PAGES = 8
+
+# Layout analysis: pages are subsampled to about this width first
+LAYOUT_WIDTH = 640
+DARK_THRESHOLD = 128
+MIN_GUTTER_WIDTH = 0.015   # of page width
+MIN_COLUMN_WIDTH = 0.15    # of the inked width
+GUTTER_INK = 0.03          # share of text rows a gutter column may touch (headings, rules)
+CROP_PADDING = 0.01        # of page width, kept around column crops for the recognizers
+
+
+def render_page(page, dpi: int = 300) -> Image.Image:
+    """Render one PDF page straight to an RGB PIL Image.
+
+    The pixmap's raw samples are wrapped directly, with no PNG
+    encode/decode round trip.
+    """
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    # RGB without alpha is what Surya needs and what Tesseract expects
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, alpha=False)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
 
-def pdf_to_images(pdf_path: str, dpi: int = 300) -> list:
-    """Convert PDF pages to PIL Images using PyMuPDF."""
+def iter_page_images(pdf_path: str, dpi: int = 300):
+    """Yield (page_index, image) for each PDF page, rendering one page at a time."""
     doc = fitz.open(pdf_path)
-    images = []
+    try:
+        for page_num in range(len(doc)):
+            yield page_num, render_page(doc.load_page(page_num), dpi)
+    finally:
+        doc.close()
 
-    for page_num in range(len(doc)):
-        page = doc.load_page(page_num)
-        # Create high-res image matrix
-        mat = fitz.Matrix(dpi / 72, dpi / 72)
-        pix = page.get_pixmap(matrix=mat)
 
-        # Convert to PIL Image
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
+def pdf_page_count(pdf_path: str) -> int:
+    with fitz.open(pdf_path) as doc:
+        return len(doc)
 
-        # Convert to RGB if necessary (Surya needs RGB)
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
 
-        images.append(img)
+def pdf_to_images(pdf_path: str, dpi: int = 300) -> list:
+    """Convert PDF pages to PIL Images using PyMuPDF.
 
-        print(f"  Converted page {page_num + 1}/{len(doc)}", end='\r')
+    Holds every page in memory; process_pdf() streams pages with
+    iter_page_images() instead.
+    """
+    images = []
+    page_count = pdf_page_count(pdf_path)
+    for page_num, img in iter_page_images(pdf_path, dpi):
+        images.append(img)
+        print(f"  Converted page {page_num + 1}/{page_count}", end='\r')
 
     print()
-    doc.close()
     return images
 
 
-def ocr_with_surya(images: list) -> list:
-    """Run Surya OCR on images - best for complex layouts (v0.17+ API)."""
+def load_surya_models() -> tuple:
+    """Load the Surya predictors (first run downloads ~2GB)."""
     if not SURYA_AVAILABLE:
         raise RuntimeError("Surya OCR not available")
 
@@ -70,37 +137,112 @@ def ocr_with_surya(images: list) -> list:
     foundation_predictor = FoundationPredictor()
     recognition_predictor = RecognitionPredictor(foundation_predictor)
     detection_predictor = DetectionPredictor()
+    return recognition_predictor, detection_predictor
+
+
+def resident_surya_models(engine: str) -> tuple:
+    """Load Surya once for a whole run: (models or None, engine to use).
+
+    Falls back to Tesseract when Surya cannot be loaded, as process_pdf()
+    always has.
+    """
+    if engine not in ['surya', 'both']:
+        return None, engine
+    try:
+        return load_surya_models(), engine
+    except Exception as e:
+        print(f"  Surya OCR failed: {e}")
+        if engine == 'surya':
+            print("  Falling back to Tesseract...")
+        return None, 'tesseract'
+
+
+def available_memory_mb():
+    """Available RAM in MB, or None if it cannot be determined."""
+    if PSUTIL_AVAILABLE:
+        return psutil.virtual_memory().available / 2**20
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def tune_surya_batch_size(dpi: int = 300) -> int:
+    """Images per Surya call that fit in the RAM available right now.
+
+    Call after the models are loaded so their footprint is already taken.
+    """
+    available = available_memory_mb()
+    if available is None:
+        return SURYA_BATCH_SIZE
+    per_image = SURYA_MB_PER_IMAGE * (dpi / 300) ** 2
+    return max(1, min(SURYA_MAX_BATCH, int(available * SURYA_RAM_SHARE / per_image)))
+
+
+def surya_batch(images: list, models: tuple) -> list:
+    """Run Surya OCR on one batch of images.
+
+    Returns one {'text', 'lines'} result per image; each line has its
+    text, box and confidence (0-100).
+    """
+    recognition_predictor, detection_predictor = models
+
+    # Run OCR on batch (Surya v0.17 API - no language param needed)
+    predictions = recognition_predictor(
+        images,
+        det_predictor=detection_predictor,
+        sort_lines=True  # Helps with reading order
+    )
+
+    # Extract text from predictions
+    results = []
+    for pred in predictions:
+        lines = []
+        for line in getattr(pred, 'text_lines', None) or []:
+            if hasattr(line, 'text'):
+                entry = {'text': line.text,
+                         'box': [round(v) for v in getattr(line, 'bbox', (0, 0, 0, 0))],
+                         'conf': confidence_percent(getattr(line, 'confidence', None))}
+                # Word-level results, when this Surya version reports them
+                words = [{'text': word.text, 'box': [round(v) for v in word.bbox],
+                          'conf': confidence_percent(getattr(word, 'confidence', None))}
+                         for word in getattr(line, 'words', None) or []
+                         if getattr(word, 'text', '').strip() and hasattr(word, 'bbox')]
+                if words:
+                    entry['words'] = words
+                lines.append(entry)
+
+        if hasattr(pred, 'text'):
+            text = pred.text
+        elif isinstance(pred, dict) and 'text' in pred:
+            text = pred['text']
+        else:
+            # Try to extract from text_lines
+            text = '\n'.join(line['text'] for line in lines)
+        results.append({'text': text, 'lines': lines})
+    return results
+
+
+def confidence_percent(confidence):
+    """Surya scores lines 0-1; keep confidences on Tesseract's 0-100 scale."""
+    return None if confidence is None else round(confidence * 100, 2)
+
+
+def ocr_with_surya(images: list, models: tuple = None, batch_size: int = None) -> list:
+    """Run Surya OCR on images - best for complex layouts (v0.17+ API).
+
+    Pass `models` from load_surya_models() to reuse them across calls.
+    """
+    if models is None:
+        models = load_surya_models()
 
     print("Running Surya OCR...")
     texts = []
 
     # Process in batches for memory efficiency
-    batch_size = 4
+    batch_size = batch_size or tune_surya_batch_size()
     for i in range(0, len(images), batch_size):
-        batch = images[i:i+batch_size]
-
-        # Run OCR on batch (Surya v0.17 API - no language param needed)
-        predictions = recognition_predictor(
-            batch,
-            det_predictor=detection_predictor,
-            sort_lines=True  # Helps with reading order
-        )
-
-        # Extract text from predictions
-        for pred in predictions:
-            if hasattr(pred, 'text'):
-                texts.append(pred.text)
-            elif isinstance(pred, dict) and 'text' in pred:
-                texts.append(pred['text'])
-            else:
-                # Try to extract from text_lines
-                page_text = []
-                if hasattr(pred, 'text_lines'):
-                    for line in pred.text_lines:
-                        if hasattr(line, 'text'):
-                            page_text.append(line.text)
-                texts.append('\n'.join(page_text))
-
+        texts.extend(result['text'] for result in surya_batch(images[i:i+batch_size], models))
         print(f"  OCR'd page {min(i+batch_size, len(images))}/{len(images)}", end='\r')
 
     print()
@@ -129,156 +271,910 @@ def ocr_with_tesseract(images: list, psm: int = 3, oem: int = 3,
     print(f"Running Tesseract OCR (PSM={psm}, OEM={oem}, lang={lang})...")
 
     texts = []
+    for i, img in enumerate(images):
+        texts.append(tesseract_page(img, psm=psm, oem=oem, preprocess=preprocess, lang=lang))
+        print(f"  OCR'd page {i + 1}/{len(images)}", end='\r')
+
+    print()
+    return texts
+
+
+def tesseract_data(img: Image.Image, psm: int = 3, oem: int = 3,
+                   preprocess: bool = True, lang: str = 'eng') -> dict:
+    """Run Tesseract on a single image, returning its text and line boxes.
+
+    One image_to_data() call gives both. The text is laid out the way
+    Tesseract's text renderer does it (words joined by spaces, lines by
+    newlines, a blank line between paragraphs); each line carries its box
+    and mean word confidence, and its words with their own boxes and
+    confidences.
+    """
     custom_config = f'--psm {psm} --oem {oem} -l {lang}'
 
-    for i, img in enumerate(images):
-        # Optional preprocessing for better accuracy
-        if preprocess:
-            # Convert to grayscale
-            if img.mode != 'L':
-                img_processed = img.convert('L')
-            else:
-                img_processed = img
+    # Optional preprocessing for better accuracy
+    if preprocess:
+        # Convert to grayscale
+        if img.mode != 'L':
+            img_processed = img.convert('L')
         else:
             img_processed = img
+    else:
+        img_processed = img
+
+    data = pytesseract.image_to_data(img_processed, config=custom_config, output_type=Output.DICT)
+
+    # Words grouped by (block, paragraph, line), in Tesseract's reading order
+    grouped = {}
+    for i, word in enumerate(data['text']):
+        if data['level'][i] != 5 or not word.strip():
+            continue
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        x0, y0 = data['left'][i], data['top'][i]
+        x1, y1 = x0 + data['width'][i], y0 + data['height'][i]
+        if key not in grouped:
+            grouped[key] = {'words': [], 'box': [x0, y0, x1, y1]}
+        line = grouped[key]
+        line['words'].append({'text': word, 'box': [x0, y0, x1, y1], 'conf': float(data['conf'][i])})
+        box = line['box']
+        line['box'] = [min(box[0], x0), min(box[1], y0), max(box[2], x1), max(box[3], y1)]
+
+    lines = []
+    paragraphs = {}
+    for (block, par, _), line in grouped.items():
+        text = ' '.join(word['text'] for word in line['words'])
+        confs = [word['conf'] for word in line['words']]
+        lines.append({'text': text, 'box': line['box'], 'conf': round(sum(confs) / len(confs), 2),
+                      'words': line['words']})
+        paragraphs.setdefault((block, par), []).append(text)
+
+    text = '\n\n'.join('\n'.join(par_lines) for par_lines in paragraphs.values())
+    return {'text': text + '\n' if text else '', 'lines': lines}
+
+
+def tesseract_page(img: Image.Image, psm: int = 3, oem: int = 3,
+                   preprocess: bool = True, lang: str = 'eng') -> str:
+    """Run Tesseract on a single page image."""
+    return tesseract_data(img, psm=psm, oem=oem, preprocess=preprocess, lang=lang)['text']
+
+
+def tesseract_entry(img: Image.Image, psm: int = 3, oem: int = 3, analysis: dict = None,
+                    dpi: int = None) -> dict:
+    """Layout + Tesseract for one rendered page: {'layout', 'columns', 'text', 'lines', 'inked', 'dpi'}.
+
+    Two-column pages are OCR'd one region at a time and joined in reading
+    order, with line boxes in page coordinates.
+    """
+    if analysis is None:
+        analysis = analyze_layout(img)
+    regions = crop_regions(img, analysis)
+    results = [tesseract_data(crop, psm=psm, oem=oem, preprocess=True) for crop, _ in regions]
+    return dict(merge_regions(results, [origin for _, origin in regions]),
+                layout=analysis['layout'], columns=analysis['columns'],
+                inked=bool(analysis['columns']), dpi=dpi)
 
-        text = pytesseract.image_to_string(img_processed, config=custom_config)
-        texts.append(text)
-        print(f"  OCR'd page {i + 1}/{len(images)}", end='\r')
 
-    print()
-    return texts
+def tesseract_settings(psm: int, oem: int) -> dict:
+    """Tesseract options that change its output, as part of the cache key."""
+    return {'psm': psm, 'oem': oem, 'lang': 'eng', 'preprocess': True}
 
 
-def detect_layout(image: Image.Image) -> str:
+def text_layer_usable(text: str) -> bool:
+    """Quality checks for a page's embedded text.
+
+    There must be enough of it, almost no junk characters, and mostly
+    word-shaped tokens; garbled font encodings and poor OCR layers fail
+    the last check.
     """
-    Detect if page is single or two-column layout.
-    Returns 'single', 'double', or 'mixed'.
+    stripped = text.strip()
+    if len(stripped) < MIN_TEXT_LAYER_CHARS:
+        return False
+    if len(BAD_CHARS.findall(stripped)) > MAX_BAD_CHAR_SHARE * len(stripped):
+        return False
+    tokens = stripped.split()
+    wordlike = sum(1 for token in tokens if WORDLIKE.fullmatch(token))
+    return wordlike >= MIN_WORDLIKE_SHARE * len(tokens)
+
+
+def text_layer_entry(page):
+    """The page's embedded text as a page entry, or None if it fails the checks.
+
+    Line boxes are in PDF points, hence dpi 72.
+    """
+    text = page.get_text()
+    if not text_layer_usable(text):
+        return None
+    lines = []
+    for block in page.get_text('dict')['blocks']:
+        for line in block.get('lines', []):
+            line_text = ''.join(span['text'] for span in line['spans'])
+            if line_text.strip():
+                lines.append({'text': line_text, 'box': [round(v) for v in line['bbox']], 'conf': None})
+    return {'layout': TEXT_LAYER, 'columns': [], 'text': text, 'lines': lines, 'inked': True, 'dpi': 72}
+
+
+def dpi_ladder(max_dpi: int, min_dpi: int = None) -> tuple:
+    """DPIs to OCR at, lowest first: min_dpi, the DPI_STEPS between, max_dpi."""
+    if not min_dpi or min_dpi >= max_dpi:
+        return (max_dpi,)
+    return (min_dpi,) + tuple(d for d in DPI_STEPS if min_dpi < d < max_dpi) + (max_dpi,)
+
+
+def page_confidence(lines: list):
+    """Mean line confidence (0-100) weighted by line length, or None if unscored."""
+    scored = [(line['conf'], len(line['text'])) for line in lines if line.get('conf') is not None]
+    total = sum(weight for _, weight in scored)
+    if not total:
+        return None
+    return sum(conf * weight for conf, weight in scored) / total
+
+
+def needs_escalation(entry: dict) -> bool:
+    """True when an OCR attempt is too weak to keep at its DPI."""
+    confidence = page_confidence(entry['lines'])
+    if confidence is None:
+        # Nothing recognized: only worth another try if the page has ink
+        return entry.get('inked', False)
+    return confidence < MIN_CONFIDENCE
+
+
+def walk_cache(cache, page_hash: str, engine: str, settings: dict, ladder: tuple, step: int = 0) -> tuple:
+    """Follow the DPI ladder through cached attempts.
+
+    Returns (step, entry): a cached entry good enough to keep (or from the
+    last rung), or (first step that still has to be OCR'd, None).
+    """
+    while cache is not None and step < len(ladder):
+        entry = cache.get(cache.key(page_hash, ladder[step], engine, settings))
+        if entry is None:
+            break
+        if step == len(ladder) - 1 or not needs_escalation(entry):
+            return step, entry
+        step += 1
+    return step, None
+
+
+class PageRenders:
+    """Renders of one page and their layouts, made at most once per DPI."""
+
+    def __init__(self, page):
+        self.page = page
+        self.renders = {}
+
+    def get(self, dpi: int) -> tuple:
+        if dpi not in self.renders:
+            img = render_page(self.page, dpi)
+            self.renders[dpi] = (img, analyze_layout(img))
+        return self.renders[dpi]
+
+
+def tesseract_page_record(doc, index: int, ladder: tuple, psm: int = 3, oem: int = 3,
+                          cache=None, use_text_layer: bool = False, renders: PageRenders = None) -> dict:
+    """Run the per-page strategy for Tesseract and return the page record.
+
+    Uses the text layer when allowed and usable; otherwise OCRs from the
+    lowest DPI on the ladder up, re-rendering higher only while confidence
+    stays low. Cached attempts are reused at every rung. `seconds` covers
+    the whole page, rendering included.
     """
+    began = time.perf_counter()
+    page = renders.page if renders else doc.load_page(index)
+    entry = text_layer_entry(page) if use_text_layer else None
+    if entry is not None:
+        return dict(entry, page=index, cached=False, seconds=time.perf_counter() - began)
+
+    renders = renders or PageRenders(page)
+    settings = tesseract_settings(psm, oem)
+    page_hash = page_fingerprint(doc, page) if cache else None
+    step, entry = walk_cache(cache, page_hash, 'tesseract', settings, ladder)
+    ocr_ran = False
+    while entry is None:
+        img, analysis = renders.get(ladder[step])
+        entry = tesseract_entry(img, psm, oem, analysis=analysis, dpi=ladder[step])
+        ocr_ran = True
+        if cache:
+            cache.put(cache.key(page_hash, ladder[step], 'tesseract', settings), entry)
+        if needs_escalation(entry) and step + 1 < len(ladder):
+            step, entry = walk_cache(cache, page_hash, 'tesseract', settings, ladder, step + 1)
+    return dict(entry, page=index, cached=not ocr_ran, seconds=time.perf_counter() - began)
+
+
+def iter_tesseract_range(pdf_path: str, start: int, stop: int, ladder: tuple = (300,),
+                         psm: int = 3, oem: int = 3, cache_dir: str = None,
+                         use_text_layer: bool = False):
+    """Run the Tesseract page strategy on pages [start, stop), yielding page records."""
+    cache = PageCache(cache_dir) if cache_dir else None
+    with fitz.open(pdf_path) as doc:
+        for index in range(start, stop):
+            yield tesseract_page_record(doc, index, ladder, psm, oem, cache, use_text_layer)
+
+
+def ocr_page_range(pdf_path: str, start: int, stop: int, ladder: tuple = (300,),
+                   psm: int = 3, oem: int = 3, cache_dir: str = None,
+                   use_text_layer: bool = False) -> list:
+    """Worker-process entry point: each call opens its own fitz document."""
+    return list(iter_tesseract_range(pdf_path, start, stop, ladder, psm, oem, cache_dir, use_text_layer))
+
+
+def page_ranges(page_count: int, workers: int) -> list:
+    """Split pages into (start, stop) ranges, several per worker to balance load."""
+    size = max(1, min(MAX_RANGE_PAGES, page_count // (workers * 4)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def iter_tesseract_pages(pdf_path: str, page_count: int, ladder: tuple = (300,), psm: int = 3,
+                         oem: int = 3, workers: int = 1, cache_dir: str = None,
+                         use_text_layer: bool = False):
+    """Yield Tesseract page records in page order.
+
+    With workers > 1, page ranges are rendered and OCR'd in a process
+    pool; results are still yielded strictly in page order.
+    """
+    if workers <= 1:
+        yield from iter_tesseract_range(pdf_path, 0, page_count, ladder, psm, oem,
+                                        cache_dir, use_text_layer)
+        return
+
+    ranges = page_ranges(page_count, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for records in pool.map(ocr_page_range, repeat(pdf_path),
+                                [start for start, _ in ranges], [stop for _, stop in ranges],
+                                repeat(ladder), repeat(psm), repeat(oem), repeat(cache_dir),
+                                repeat(use_text_layer)):
+            yield from records
+
+
+# An indirect reference, and the keys whose references lead up the page tree, not to what is drawn
+REFERENCE = re.compile(r'(\d+) \d+ R')
+UPWARD_KEYS = re.compile(r'/(?:Parent|P)\s*\d+ \d+ R')
+
+
+def page_objects(doc, roots):
+    """The xrefs reachable from `roots`, stopping at page and page tree objects."""
+    seen = set()
+    pending = list(reversed(roots))
+    while pending:
+        xref = pending.pop()
+        if xref in seen or doc.xref_get_key(xref, 'Type')[1] in ('/Page', '/Pages'):
+            continue
+        seen.add(xref)
+        yield xref
+        source = UPWARD_KEYS.sub('', doc.xref_object(xref, compressed=True))
+        pending.extend(int(ref) for ref in reversed(REFERENCE.findall(source)))
+
+
+def page_fingerprint(doc, page) -> str:
+    """Hash of everything a page draws, taken from the PDF without rendering.
+
+    Covers the page geometry, its content streams, and every object its
+    resource dictionary (inherited if need be) and annotations lead to:
+    images, form XObjects, fonts, graphics states, shadings, patterns,
+    annotation appearance streams and so on.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((tuple(page.rect), page.rotation)).encode())
+    digest.update(page.read_contents())
+    owner = page.xref
+    kind, resources = doc.xref_get_key(owner, 'Resources')
+    while kind == 'null' and doc.xref_get_key(owner, 'Parent')[0] == 'xref':
+        owner = int(doc.xref_get_key(owner, 'Parent')[1].split()[0])
+        kind, resources = doc.xref_get_key(owner, 'Resources')
+    annotations = doc.xref_get_key(page.xref, 'Annots')[1]
+    roots = []
+    for value in (resources, annotations):
+        digest.update(value.encode())
+        roots.extend(int(ref) for ref in REFERENCE.findall(value))
+    for xref in page_objects(doc, roots):
+        digest.update(doc.xref_object(xref, compressed=True).encode())
+        digest.update(doc.xref_stream_raw(xref) or b'')
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def engine_version(engine: str) -> str:
+    try:
+        if engine == 'tesseract':
+            return str(pytesseract.get_tesseract_version())
+        return metadata.version('surya-ocr')
+    except Exception:
+        return 'unknown'
+
+
+class PageCache:
+    """Content-addressed per-page OCR results, one JSON file per key.
+
+    A key hashes (page fingerprint, DPI, engine, engine settings, engine
+    version), so re-runs and parameter sweeps only OCR pages whose result
+    is not stored yet. Entries are written to a temp file and renamed into
+    place, so worker processes can share one cache directory.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def key(self, page_hash: str, dpi: int, engine: str, settings: dict) -> str:
+        raw = json.dumps([OCR_CACHE_VERSION, page_hash, dpi, engine, settings, engine_version(engine)],
+                         sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str):
+        try:
+            with open(self.path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, entry: dict):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def analyze_layout(image: Image.Image) -> dict:
+    """
+    Find text columns from the page's vertical projection profile.
+
+    Returns {'layout': 'single' | 'double', 'columns': [...], 'regions': [...]}
+    where columns are (x0, y0, x1, y1) boxes left to right in image
+    coordinates and regions are the boxes to OCR in reading order: any
+    full-width band above the columns (titles that cross the gutter), the
+    columns, then any full-width band below them. Gutters are found
+    anywhere across the page; blank pages have no columns or regions.
+    """
+    width, height = image.size
+    # Nearest-neighbour subsampling is enough for a projection profile
+    # and keeps a 300 DPI page to a few milliseconds
+    step = max(1, round(width / LAYOUT_WIDTH))
+    small = image.resize((max(1, width // step), max(1, height // step)), Image.NEAREST)
+    ink = np.asarray(small.convert('L')) < DARK_THRESHOLD
+
+    inked_rows = np.flatnonzero(ink.any(axis=1))
+    if not inked_rows.size:
+        return {'layout': 'single', 'columns': [], 'regions': []}
+    y0, y1 = inked_rows[0] * step, min(height, (inked_rows[-1] + 1) * step)
+
+    # Profile the body only (10%-90% of the height), skipping running heads and folios
+    body = ink[int(ink.shape[0] * 0.1):int(ink.shape[0] * 0.9)]
+    body_rows = np.count_nonzero(body.any(axis=1))
+    profile = body.sum(axis=0)
+    inked = np.flatnonzero(profile)
+    if not inked.size:
+        return {'layout': 'single', 'columns': [(0, y0, width, y1)], 'regions': [(0, y0, width, y1)]}
+    left, right = inked[0], inked[-1] + 1
+
+    # Runs of (nearly) empty columns inside the inked span are gutter candidates
+    low = (profile[left:right] <= GUTTER_INK * body_rows).astype(np.int8)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], low, [0]))))
+    min_gutter = MIN_GUTTER_WIDTH * ink.shape[1]
+    min_column = MIN_COLUMN_WIDTH * (right - left)
+
+    bounds = []
+    x = left
+    for start, stop in zip(edges[::2] + left, edges[1::2] + left):
+        if stop - start < min_gutter or start - x < min_column or right - stop < min_column:
+            continue
+        bounds.append((x, start))
+        x = stop
+    bounds.append((x, right))
+
+    # Text lines (runs of inked rows) with ink in a gutter span the page;
+    # those before the first (or after the last) column-only line form
+    # full-width bands outside the columns
+    gutter = np.zeros(ink.shape[1], dtype=bool)
+    for (_, stop), (start, _) in zip(bounds, bounds[1:]):
+        gutter[stop:start] = True
+    breaks = np.flatnonzero(np.diff(inked_rows) > 1) + 1
+    lines = [(run[0], run[-1] + 1) for run in np.split(inked_rows, breaks)]
+    column_lines = [(r0, r1) for r0, r1 in lines if not ink[r0:r1, gutter].any()]
+
+    if len(bounds) == 1 or not column_lines:
+        box = (int(left * step), int(y0), int(min(width, right * step)), int(y1))
+        return {'layout': 'single', 'columns': [box], 'regions': [box]}
+    top, bottom = column_lines[0][0], column_lines[-1][1]
+
+    def box(x0, x1, r0, r1):
+        return (int(x0 * step), int(r0 * step), int(min(width, x1 * step)), int(min(height, r1 * step)))
+
+    columns = [box(x0, x1, top, bottom) for x0, x1 in bounds]
+    regions = []
+    if top > inked_rows[0]:
+        regions.append(box(left, right, inked_rows[0], top))
+    regions.extend(columns)
+    if bottom <= inked_rows[-1]:
+        regions.append(box(left, right, bottom, inked_rows[-1] + 1))
+    return {'layout': 'double', 'columns': columns, 'regions': regions}
+
+
+def crop_regions(image: Image.Image, analysis: dict) -> list:
+    """(crop, origin) pairs to send to a recognizer, in reading order.
+
+    Single-column and blank pages go through whole, as before; two-column
+    pages are cut into their regions with a little margin kept around each.
+    """
+    if analysis['layout'] != 'double':
+        return [(image, (0, 0))]
     width, height = image.size
-    gray = image.convert('L')
+    pad = int(width * CROP_PADDING)
+    regions = []
+    for x0, y0, x1, y1 in analysis['regions']:
+        box = (max(0, x0 - pad), max(0, y0 - pad), min(width, x1 + pad), min(height, y1 + pad))
+        regions.append((image.crop(box), box[:2]))
+    return regions
 
-    # Sample the middle 10% of the image width
-    middle_start = int(width * 0.45)
-    middle_end = int(width * 0.55)
 
-    # Count dark pixels (text) in middle strip
-    middle_region = gray.crop((middle_start, int(height * 0.1), middle_end, int(height * 0.9)))
-    pixels = list(middle_region.getdata())
-    dark_pixels = sum(1 for p in pixels if p < 128)
-    total_pixels = len(pixels)
+def join_regions(texts: list) -> str:
+    """Concatenate per-region OCR text in reading order."""
+    if len(texts) == 1:
+        return texts[0]
+    return '\n\n'.join(text.strip('\n') for text in texts if text.strip())
 
-    dark_ratio = dark_pixels / total_pixels if total_pixels > 0 else 0
 
-    if dark_ratio < 0.05:
-        return 'double'
-    else:
-        return 'single'
+def merge_regions(results: list, origins: list) -> dict:
+    """Combine per-region {'text', 'lines'} results into one page result.
+
+    Line and word boxes are shifted from crop to page coordinates.
+    """
+    def shifted(box, ox, oy):
+        x0, y0, x1, y1 = box
+        return [x0 + ox, y0 + oy, x1 + ox, y1 + oy]
+
+    lines = []
+    for result, (ox, oy) in zip(results, origins):
+        for line in result['lines']:
+            line = dict(line, box=shifted(line['box'], ox, oy))
+            if 'words' in line:
+                line['words'] = [dict(word, box=shifted(word['box'], ox, oy)) for word in line['words']]
+            lines.append(line)
+    return {'text': join_regions([result['text'] for result in results]), 'lines': lines}
+
+
+def detect_layout(image: Image.Image) -> str:
+    """
+    Detect if page is single or two-column layout.
+    Returns 'single' or 'double'; see analyze_layout() for the column boxes.
+    """
+    return analyze_layout(image)['layout']
+
+
+def page_record(index: int, record: dict) -> dict:
+    """The structured sidecar record for one page (see ocr_pages.py)."""
+    confidence = page_confidence(record['lines'])
+    return {
+        'page': index + 1,
+        'layout': record['layout'],
+        'columns': record.get('columns', []),
+        'dpi': record.get('dpi'),
+        'cached': record.get('cached', False),
+        'seconds': round(record.get('seconds', 0.0), 3),
+        'confidence': None if confidence is None else round(confidence, 2),
+        'text': record['text'],
+        'lines': record['lines'],
+    }
+
+
+class PageWriter:
+    """Writes one engine's output page by page as OCR results arrive.
+
+    Keeps the full-document file open and adds a per-page file for each
+    page, so nothing but the text of the page at hand is held in memory.
+    Alongside them goes the page-record sidecar (ocr_<engine>_<timestamp>.jsonl)
+    with lines, word boxes, confidences, columns and timings.
+    """
+
+    def __init__(self, output_dir: Path, eng_name: str, pdf_name: str, timestamp: str,
+                 page_count: int, dpi, psm: int):
+        self.eng_name = eng_name
+        self.output_file = output_dir / f"ocr_{eng_name}_{timestamp}.txt"
+        self.pages_dir = output_dir / f"{eng_name}_pages"
+        self.pages_dir.mkdir(exist_ok=True)
+        self.total_chars = 0
+        date = datetime.now().isoformat()
+
+        self.records = PageRecordWriter(output_dir / f"ocr_{eng_name}_{timestamp}.jsonl", {
+            'pdf': pdf_name, 'engine': eng_name, 'date': date, 'page_count': page_count,
+            'dpi': dpi, 'psm': psm if eng_name == 'tesseract' else None})
+
+        self.f = open(self.output_file, 'w', encoding='utf-8')
+        self.f.write(f"# OCR Output: {pdf_name}\n")
+        self.f.write(f"# Engine: {eng_name.upper()}\n")
+        self.f.write(f"# Date: {date}\n")
+        self.f.write(f"# Pages: {page_count}\n")
+        self.f.write(f"# DPI: {dpi}\n")
+        if eng_name == 'tesseract':
+            self.f.write(f"# PSM: {psm}\n")
+        self.f.write("=" * 60 + "\n\n")
+
+    def write(self, index: int, record: dict):
+        layout, text = record['layout'], record['text']
+        self.f.write(f"\n{'='*60}\n")
+        self.f.write(f"PAGE {index + 1} (Layout: {layout})\n")
+        self.f.write(f"{'='*60}\n\n")
+        self.f.write(text)
+        self.f.write("\n")
+        self.f.flush()
+
+        # Also save per-page files for review
+        page_file = self.pages_dir / f"page_{index+1:03d}.txt"
+        with open(page_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        self.records.write(page_record(index, record))
+        self.total_chars += len(text)
+
+    def close(self):
+        self.f.close()
+        self.records.close()
+        print(f"  Saved: {self.output_file}")
+        print(f"  Saved: {self.records.path}")
+
+
+class SuryaQueue:
+    """Pages waiting for Surya, written out in page order.
+
+    Column crops from several pages go to Surya together, in batches of
+    `batch_size` images. Pages whose confidence comes back too low are
+    re-rendered at the next DPI on the ladder and queued again. Finished
+    pages, including cache hits and text-layer pages that wait behind
+    them, are handed to `write` in order.
+
+    If Surya fails on a batch, those pages and every page after them are
+    OCR'd with Tesseract (at `psm`/`oem`) instead, and their records say so.
+    """
+
+    def __init__(self, models: tuple, batch_size: int, doc, ladder: tuple, cache, write,
+                 psm: int = 3, oem: int = 3):
+        self.models = models
+        self.batch_size = batch_size
+        self.doc = doc
+        self.ladder = ladder
+        self.cache = cache
+        self.write = write
+        self.psm = psm
+        self.oem = oem
+        self.fallbacks = 0
+        self.pending = []
+
+    def queued(self) -> int:
+        return sum(len(item['crops']) for item in self.pending if item.get('crops'))
+
+    def add_record(self, record: dict):
+        """Queue a page that needs no OCR."""
+        self.pending.append({'page': record['page'], 'record': record})
+        if not self.queued():
+            self.flush()
+
+    def add_page(self, index: int, renders: PageRenders, page_hash: str = None):
+        """Queue a page for OCR, unless the cache already has it."""
+        began = time.perf_counter()
+        step, entry = walk_cache(self.cache, page_hash, 'surya', {}, self.ladder)
+        item = {'page': index, 'hash': page_hash, 'step': step, 'seconds': 0.0}
+        if entry is not None:
+            item['record'] = dict(entry, page=index, cached=True, seconds=time.perf_counter() - began)
+        elif self.models is None:
+            self.fall_back(item, renders)
+        else:
+            self.render(item, renders)
+        self.pending.append(item)
+
+        queued = self.queued()
+        if queued >= self.batch_size or not queued:
+            self.flush()
+
+    def render(self, item: dict, renders: PageRenders):
+        img, analysis = renders.get(self.ladder[item['step']])
+        item['analysis'] = analysis
+        # Column crops go to Surya together, batched across pages
+        item['crops'] = crop_regions(img, analysis)
+
+    def fall_back(self, item: dict, renders: PageRenders = None):
+        """Give a page Tesseract's record, for when Surya has failed."""
+        item.pop('crops', None)
+        item.pop('analysis', None)
+        record = tesseract_page_record(self.doc, item['page'], self.ladder, self.psm, self.oem,
+                                       self.cache, renders=renders)
+        item['record'] = dict(record, engine='tesseract', seconds=item['seconds'] + record['seconds'])
+        self.fallbacks += 1
+
+    def flush(self):
+        while True:
+            todo = [item for item in self.pending if item.get('crops')]
+            if not todo:
+                break
+            crops = [crop for item in todo for crop, _ in item['crops']]
+            began = time.perf_counter()
+            results = []
+            try:
+                for i in range(0, len(crops), self.batch_size):
+                    results.extend(surya_batch(crops[i:i + self.batch_size], self.models))
+            except Exception as e:
+                print(f"  Surya OCR failed on pages {todo[0]['page'] + 1}-{todo[-1]['page'] + 1}: {e}")
+                print("  Falling back to Tesseract for the rest of the book...")
+                self.models = None
+                for item in todo:
+                    self.fall_back(item)
+                continue
+            seconds = time.perf_counter() - began
+            print(f"  Pages {todo[0]['page'] + 1}-{todo[-1]['page'] + 1}: "
+                  f"surya {seconds:.2f}s ({seconds / len(todo):.2f}s/page)")
+
+            results = iter(results)
+            for item in todo:
+                regions = item.pop('crops')
+                analysis = item.pop('analysis')
+                dpi = self.ladder[item['step']]
+                entry = dict(merge_regions([next(results) for _ in regions],
+                                           [origin for _, origin in regions]),
+                             layout=analysis['layout'], columns=analysis['columns'],
+                             inked=bool(analysis['columns']), dpi=dpi)
+                item['seconds'] += seconds / len(todo)
+                if self.cache:
+                    self.cache.put(self.cache.key(item['hash'], dpi, 'surya', {}), entry)
+
+                if needs_escalation(entry) and item['step'] + 1 < len(self.ladder):
+                    item['step'], cached = walk_cache(self.cache, item['hash'], 'surya', {},
+                                                      self.ladder, item['step'] + 1)
+                    if cached is None:
+                        self.render(item, PageRenders(self.doc.load_page(item['page'])))
+                        continue
+                    entry = cached
+                item['record'] = dict(entry, page=item['page'], cached=False, seconds=item['seconds'])
+
+        for item in self.pending:
+            self.write(item['record'])
+        self.pending.clear()
 
 
 def process_pdf(pdf_path: str, output_dir: str, engine: str = 'surya',
-                dpi: int = 300, psm: int = 3):
+                dpi: int = 300, psm: int = 3, workers: int = 1, oem: int = 3,
+                cache_dir: str = None, surya_models: tuple = None,
+                surya_batch_size: int = None, strategy: str = 'auto',
+                min_dpi: int = DEFAULT_MIN_DPI):
     """
     Process PDF with OCR and save results.
+
+    Each page gets a strategy. With strategy 'auto', a page whose
+    embedded text passes text_layer_usable() is taken as-is; other pages
+    are OCR'd from min_dpi up to dpi, escalating only while recognition
+    confidence stays low. Strategy 'ocr' OCRs every page at dpi.
+
+    Pages are rendered, analyzed, OCR'd and written one at a time (Surya
+    takes them in RAM-sized batches of images), so memory stays flat
+    regardless of book length. Two-column pages reach both engines as
+    column crops in reading order rather than as whole pages. With
+    workers > 1, Tesseract runs on page ranges in a process pool while
+    Surya stays in this process. With a cache_dir, pages already OCR'd
+    with the same settings are read back instead of being recomputed.
+    Pass `surya_models` to reuse models that are already loaded. With
+    both engines, every page is also fused (see ocr_fusion.py) into a third
+    output, within the same pass. Every output has a page-record sidecar
+    (see ocr_pages.py) with per-word boxes and confidences.
     """
     pdf_path = Path(pdf_path)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    use_text_layer = strategy == 'auto'
+    ladder = dpi_ladder(dpi, min_dpi if strategy == 'auto' else None)
+    dpi_label = str(dpi) if len(ladder) == 1 else f"{ladder[0]}-{ladder[-1]} (adaptive)"
+
     print(f"\n{'='*60}")
     print(f"OCR Processing: {pdf_path.name}")
     print(f"Engine: {engine.upper()}")
-    print(f"DPI: {dpi}")
+    print(f"Strategy: {strategy}")
+    print(f"DPI: {dpi_label}")
     if engine in ['tesseract', 'both']:
-        print(f"Tesseract PSM: {psm}")
+        print(f"Tesseract PSM: {psm}, OEM: {oem}")
+        print(f"Workers: {workers}")
+    if cache_dir:
+        print(f"Page cache: {cache_dir}")
     print(f"{'='*60}\n")
 
-    # Convert PDF to images
-    print("Step 1: Converting PDF to images...")
-    images = pdf_to_images(str(pdf_path), dpi=dpi)
-    print(f"  Total pages: {len(images)}")
-
-    # Detect layouts
-    print("\nStep 2: Analyzing page layouts...")
-    layouts = []
-    for i, img in enumerate(images):
-        layout = detect_layout(img)
-        layouts.append(layout)
-
-    single_count = layouts.count('single')
-    double_count = layouts.count('double')
-    print(f"  Single-column pages: {single_count}")
-    print(f"  Two-column pages: {double_count}")
+    page_count = pdf_page_count(str(pdf_path))
+    print(f"Total pages: {page_count}")
 
-    # Run OCR
-    results = {}
-
-    if engine in ['surya', 'both']:
-        print("\nStep 3a: Running Surya OCR (optimized for layouts)...")
-        try:
-            surya_texts = ocr_with_surya(images)
-            results['surya'] = surya_texts
-        except Exception as e:
-            print(f"  Surya OCR failed: {e}")
-            if engine == 'surya':
-                print("  Falling back to Tesseract...")
-                engine = 'tesseract'
+    if surya_models is None:
+        surya_models, engine = resident_surya_models(engine)
+    elif engine == 'tesseract':
+        surya_models = None
 
+    engines = []
+    if surya_models is not None:
+        engines.append('surya')
+        surya_batch_size = surya_batch_size or tune_surya_batch_size(ladder[-1])
+        print(f"Surya batch size: {surya_batch_size} images")
     if engine in ['tesseract', 'both']:
-        print(f"\nStep 3b: Running Tesseract OCR (PSM={psm})...")
-        tesseract_texts = ocr_with_tesseract(images, psm=psm, preprocess=True)
-        results['tesseract'] = tesseract_texts
+        engines.append('tesseract')
 
-    # Save results
-    print("\nStep 4: Saving results...")
+    cache = PageCache(cache_dir) if cache_dir else None
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    writers = {eng_name: PageWriter(output_dir, eng_name, pdf_path.name, timestamp,
+                                    page_count, dpi_label, psm)
+               for eng_name in engines}
+    results = {eng_name: [] for eng_name in engines}
+    stats = {eng_name: {'seconds': 0.0, 'hits': 0, 'misses': 0, 'text_layer': 0, 'escalated': 0}
+             for eng_name in engines}
+    layouts = []
 
-    for eng_name, texts in results.items():
-        # Full document
-        output_file = output_dir / f"ocr_{eng_name}_{timestamp}.txt"
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# OCR Output: {pdf_path.name}\n")
-            f.write(f"# Engine: {eng_name.upper()}\n")
-            f.write(f"# Date: {datetime.now().isoformat()}\n")
-            f.write(f"# Pages: {len(texts)}\n")
-            f.write(f"# DPI: {dpi}\n")
-            if eng_name == 'tesseract':
-                f.write(f"# PSM: {psm}\n")
-            f.write("=" * 60 + "\n\n")
-
-            for i, text in enumerate(texts):
-                layout = layouts[i] if i < len(layouts) else 'unknown'
-                f.write(f"\n{'='*60}\n")
-                f.write(f"PAGE {i + 1} (Layout: {layout})\n")
-                f.write(f"{'='*60}\n\n")
-                f.write(text)
-                f.write("\n")
-
-        print(f"  Saved: {output_file}")
-
-        # Also save per-page files for review
-        pages_dir = output_dir / f"{eng_name}_pages"
-        pages_dir.mkdir(exist_ok=True)
-
-        for i, text in enumerate(texts):
-            page_file = pages_dir / f"page_{i+1:03d}.txt"
-            with open(page_file, 'w', encoding='utf-8') as f:
-                f.write(text)
+    # With both engines, each page is fused as soon as both have written it
+    fusing = len(engines) == 2
+    fusion_pending = {}
+    if fusing:
+        writers['fused'] = PageWriter(output_dir, 'fused', pdf_path.name, timestamp,
+                                      page_count, dpi_label, psm)
+        results['fused'] = []
+
+    def write_fused():
+        index = len(results['fused'])
+        while len(fusion_pending.get(index, {})) == 2:
+            records = fusion_pending.pop(index)
+            tesseract = records['tesseract']
+            if tesseract['layout'] == TEXT_LAYER:
+                fused = tesseract
+            else:
+                # Fused boxes are in PDF points
+                fused = dict(fuse_page({name: records[name] for name in engines}),
+                             layout=tesseract['layout'], columns=tesseract.get('columns', []), dpi=72,
+                             seconds=sum(record['seconds'] for record in records.values()))
+            writers['fused'].write(index, fused)
+            results['fused'].append(fused['text'])
+            index += 1
+
+    def write(eng_name, record):
+        writers[eng_name].write(record['page'], record)
+        results[eng_name].append(record['text'])
+        eng_stats = stats[eng_name]
+        eng_stats['seconds'] += record['seconds']
+        if record['layout'] == TEXT_LAYER:
+            eng_stats['text_layer'] += 1
+        else:
+            eng_stats['hits' if record['cached'] else 'misses'] += 1
+            if record['dpi'] != ladder[0]:
+                eng_stats['escalated'] += 1
+        if eng_name == engines[0]:
+            layouts.append(record['layout'])
+        if fusing:
+            fusion_pending.setdefault(record['page'], {})[eng_name] = record
+            write_fused()
+
+    def write_tesseract(record):
+        write('tesseract', record)
+        if record['layout'] == TEXT_LAYER:
+            source = 'text layer'
+        else:
+            source = 'cached' if record['cached'] else f"{record['seconds']:.2f}s"
+            source = f"tesseract {source} @ {record['dpi']} DPI"
+        print(f"  Page {record['page'] + 1}/{page_count} ({record['layout']}): {source}")
+
+    # Tesseract pages come from their own (possibly pooled) stream unless
+    # they can share the Surya loop's rendered images in this process
+    tesseract_pages = None
+    if 'tesseract' in engines and ('surya' not in engines or workers > 1):
+        tesseract_pages = iter_tesseract_pages(str(pdf_path), page_count, ladder, psm, oem,
+                                               workers, cache_dir, use_text_layer)
+
+    print(f"\nRunning OCR with {' + '.join(e.title() for e in engines)}...")
+    started = time.perf_counter()
+    try:
+        if 'surya' in engines:
+            doc = fitz.open(str(pdf_path))
+            try:
+                queue = SuryaQueue(surya_models, surya_batch_size, doc, ladder, cache,
+                                   lambda record: write('surya', record), psm, oem)
+                for index in range(page_count):
+                    began = time.perf_counter()
+                    page = doc.load_page(index)
+                    text_entry = text_layer_entry(page) if use_text_layer else None
+                    renders = PageRenders(page)
+
+                    if tesseract_pages is not None:
+                        write_tesseract(next(tesseract_pages))
+                    elif 'tesseract' in engines and text_entry is None:
+                        write_tesseract(tesseract_page_record(doc, index, ladder, psm, oem, cache,
+                                                             renders=renders))
+
+                    if text_entry is not None:
+                        record = dict(text_entry, page=index, cached=False,
+                                      seconds=time.perf_counter() - began)
+                        if 'tesseract' in engines and tesseract_pages is None:
+                            write_tesseract(record)
+                        queue.add_record(record)
+                    else:
+                        queue.add_page(index, renders, page_fingerprint(doc, page) if cache else None)
+                queue.flush()
+                if queue.fallbacks:
+                    print(f"  Surya failed; {queue.fallbacks} of its pages were OCR'd by Tesseract")
+            finally:
+                doc.close()
+        else:
+            for record in tesseract_pages:
+                write_tesseract(record)
+    finally:
+        if tesseract_pages is not None:
+            tesseract_pages.close()
+        for writer in writers.values():
+            writer.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n  Text-layer pages: {layouts.count(TEXT_LAYER)}")
+    print(f"  Single-column pages: {layouts.count('single')}")
+    print(f"  Two-column pages: {layouts.count('double')}")
 
     # Summary
     print(f"\n{'='*60}")
     print("OCR Complete!")
     print(f"{'='*60}")
     print(f"Output directory: {output_dir}")
-
-    for eng_name in results:
-        total_chars = sum(len(t) for t in results[eng_name])
-        print(f"  {eng_name.upper()}: {total_chars:,} characters extracted")
+    print(f"Wall time: {elapsed:.1f}s ({page_count / elapsed if elapsed else 0:.2f} pages/s)")
+
+    for eng_name in engines:
+        writer = writers[eng_name]
+        eng_stats = stats[eng_name]
+        print(f"  {eng_name.upper()}: {writer.total_chars:,} characters extracted, "
+              f"{eng_stats['seconds'] / max(page_count, 1):.2f}s/page")
+        print(f"    OCR'd pages: {eng_stats['hits'] + eng_stats['misses']} "
+              f"({eng_stats['escalated']} escalated above {ladder[0]} DPI), "
+              f"text layer: {eng_stats['text_layer']}")
+        if cache:
+            print(f"    Cache: {eng_stats['hits']} hits, {eng_stats['misses']} misses")
+    if fusing:
+        print(f"  FUSED: {writers['fused'].total_chars:,} characters, "
+              f"word confidences in {writers['fused'].records.path.name}")
 
     return results
 
 
+def iter_pdf_queue(directory: str, watch: float = None):
+    """Yield the PDFs in a directory, oldest name first.
+
+    With `watch` (seconds), keep polling for PDFs that appear or change
+    later, skipping any still being written (modified within the last
+    poll interval), until interrupted.
+    """
+    seen = set()
+    while True:
+        for path in sorted(Path(directory).glob('*.pdf')):
+            mtime = path.stat().st_mtime
+            if (path, mtime) in seen or (watch and time.time() - mtime < watch):
+                continue
+            seen.add((path, mtime))
+            yield path
+        if not watch:
+            return
+        time.sleep(watch)
+
+
+def process_queue(pdf_paths, output_root: str, engine: str = 'surya', watch: bool = False,
+                  surya_batch_size: int = None, **options) -> dict:
+    """OCR a stream of PDFs, loading the Surya models once for all of them.
+
+    Each book gets its own output directory under `output_root`; every
+    other option is passed to process_pdf(). Returns characters extracted
+    per engine for each book.
+    """
+    surya_models, engine = resident_surya_models(engine)
+    totals = {}
+    try:
+        for pdf_path in pdf_paths:
+            results = process_pdf(str(pdf_path), str(Path(output_root) / Path(pdf_path).stem),
+                                  engine=engine, surya_models=surya_models,
+                                  surya_batch_size=surya_batch_size, **options)
+            totals[Path(pdf_path).name] = {eng_name: sum(len(t) for t in texts)
+                                           for eng_name, texts in results.items()}
+            if watch:
+                print("\nWaiting for more PDFs (Ctrl+C to stop)...")
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+    print(f"\nBooks processed: {len(totals)}")
+    for name, chars in totals.items():
+        print(f"  {name}: " + ", ".join(f"{eng_name} {count:,} chars" for eng_name, count in chars.items()))
+    return totals
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="OCR a PDF book with support for two-column layouts",
@@ -289,19 +1185,40 @@ Examples:
   python ocr_book.py book.pdf --engine tesseract # Use Tesseract
   python ocr_book.py book.pdf --engine both      # Compare both
   python ocr_book.py book.pdf --dpi 400          # Higher quality
+  python ocr_book.py book.pdf --strategy ocr     # OCR every page, fixed DPI
   python ocr_book.py book.pdf --psm 4            # Single column mode
   python ocr_book.py book.pdf --psm 1            # Auto with OSD
+  python ocr_book.py book.pdf -e tesseract -w 8  # Tesseract on 8 cores
+  python ocr_book.py books/                      # Every PDF in a folder
+  python ocr_book.py inbox/ --watch 30           # Keep OCR'ing new PDFs
         """
     )
 
-    parser.add_argument('pdf_path', help='Path to the PDF file')
+    parser.add_argument('pdf_path', help='Path to the PDF file, or a directory of PDFs')
     parser.add_argument('--output', '-o', help='Output directory (default: same as PDF)')
     parser.add_argument('--engine', '-e', choices=['surya', 'tesseract', 'both'],
                         default='surya', help='OCR engine to use (default: surya)')
     parser.add_argument('--dpi', '-d', type=int, default=300,
-                        help='DPI for PDF rendering (default: 300)')
+                        help='DPI for PDF rendering; the highest DPI tried with --strategy auto (default: 300)')
+    parser.add_argument('--min-dpi', type=int, default=DEFAULT_MIN_DPI,
+                        help=f'First DPI tried with --strategy auto (default: {DEFAULT_MIN_DPI})')
+    parser.add_argument('--strategy', choices=['auto', 'ocr'], default='auto',
+                        help="auto: use a good text layer, else OCR with adaptive DPI; "
+                             "ocr: OCR every page at --dpi (default: auto)")
     parser.add_argument('--psm', type=int, default=3,
                         help='Tesseract PSM mode (default: 3)')
+    parser.add_argument('--oem', type=int, default=3,
+                        help='Tesseract OEM mode (default: 3)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Processes for Tesseract rendering + OCR (default: 1)')
+    parser.add_argument('--cache-dir',
+                        help=f'Per-page OCR cache (default: {CACHE_DIRNAME} in the output directory)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='OCR every page, ignoring and not updating the page cache')
+    parser.add_argument('--batch-size', type=int,
+                        help='Images per Surya call (default: tuned to available RAM)')
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                        help='With a directory, keep polling it for new PDFs every SECONDS')
 
     args = parser.parse_args()
 
@@ -310,10 +1227,25 @@ Examples:
         print(f"Error: PDF file not found: {pdf_path}")
         sys.exit(1)
 
-    output_dir = args.output or pdf_path.parent / "ocr_output"
-
-    process_pdf(str(pdf_path), str(output_dir), engine=args.engine,
-                dpi=args.dpi, psm=args.psm)
+    if pdf_path.is_dir():
+        output_dir = args.output or pdf_path / "ocr_output"
+    else:
+        output_dir = args.output or pdf_path.parent / "ocr_output"
+
+    # One cache for every book in a directory run
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or str(Path(output_dir) / CACHE_DIRNAME)
+
+    options = dict(dpi=args.dpi, psm=args.psm, workers=args.workers, oem=args.oem,
+                   cache_dir=cache_dir, strategy=args.strategy, min_dpi=args.min_dpi)
+    if pdf_path.is_dir():
+        process_queue(iter_pdf_queue(str(pdf_path), args.watch), str(output_dir),
+                      engine=args.engine, watch=bool(args.watch),
+                      surya_batch_size=args.batch_size, **options)
+    else:
+        process_pdf(str(pdf_path), str(output_dir), engine=args.engine,
+                    surya_batch_size=args.batch_size, **options)
 
 
 if __name__ == '__main__':
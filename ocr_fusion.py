@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Line-level fusion of Surya and Tesseract OCR for ocr_book.py
+
+Both engines' page results carry line boxes and confidences (0-100).
+Lines are paired by box overlap, the words of each pair are aligned, and
+every disagreement goes to the engine that is more confident about it.
+Words only one engine saw are kept when that engine is confident enough.
+The result is one page text plus a per-word confidence map.
+"""
+
+import re
+from difflib import SequenceMatcher
+
+# Words seen by only one engine are kept at or above this confidence
+MIN_SINGLE_ENGINE_CONF = 60.0
+
+# Share of the shorter line's height two lines must overlap to be paired
+MIN_LINE_OVERLAP = 0.5
+
+# A vertical gap over this share of the typical line height starts a paragraph
+PARAGRAPH_GAP = 0.8
+
+NORMALIZE = re.compile(r"[^\w]+")
+
+
+def scaled(box, dpi):
+    """Box in PDF points, so results rendered at different DPIs line up."""
+    factor = 72 / dpi if dpi else 1
+    return [v * factor for v in box]
+
+
+def line_words(line: dict, dpi: int) -> list:
+    """A line's words as {'text', 'box', 'conf'} in points.
+
+    Engines that only report whole lines get word boxes spread over the
+    line box by character offset, each word taking the line confidence.
+    """
+    if line.get('words'):
+        return [{'text': word['text'], 'box': scaled(word['box'], dpi), 'conf': word['conf']}
+                for word in line['words']]
+
+    x0, y0, x1, y1 = scaled(line['box'], dpi)
+    text = line['text']
+    width = (x1 - x0) / max(len(text), 1)
+    return [{'text': match.group(), 'conf': line.get('conf'),
+             'box': [x0 + match.start() * width, y0, x0 + match.end() * width, y1]}
+            for match in re.finditer(r'\S+', text)]
+
+
+def page_lines(entry: dict) -> list:
+    """An engine's page entry as lines of scaled words, in reading order."""
+    lines = []
+    for line in entry['lines']:
+        words = line_words(line, entry.get('dpi'))
+        if words:
+            lines.append({'box': scaled(line['box'], entry.get('dpi')), 'words': words})
+    return lines
+
+
+def vertical_overlap(a: list, b: list) -> float:
+    if a[2] <= b[0] or b[2] <= a[0]:
+        return 0.0
+    overlap = min(a[3], b[3]) - max(a[1], b[1])
+    shorter = min(a[3] - a[1], b[3] - b[1])
+    return overlap / shorter if shorter > 0 else 0.0
+
+
+def match_lines(primary: list, secondary: list) -> dict:
+    """Pair secondary lines with primary lines by box overlap: {secondary index: primary index}."""
+    matches = {}
+    taken = set()
+    for j, line in enumerate(secondary):
+        best, best_overlap = None, MIN_LINE_OVERLAP
+        for i, candidate in enumerate(primary):
+            if i in taken:
+                continue
+            overlap = vertical_overlap(candidate['box'], line['box'])
+            if overlap >= best_overlap:
+                best, best_overlap = i, overlap
+        if best is not None:
+            matches[j] = best
+            taken.add(best)
+    return matches
+
+
+def normalized(word: dict) -> str:
+    return NORMALIZE.sub('', word['text']).lower()
+
+
+def confidence(word: dict) -> float:
+    return word['conf'] if word['conf'] is not None else 0.0
+
+
+def fused_word(word: dict, source: str, conf=None) -> dict:
+    return {'text': word['text'], 'box': [round(v, 1) for v in word['box']],
+            'conf': round(confidence(word) if conf is None else conf, 2), 'source': source}
+
+
+def single_engine_words(words: list, source: str) -> list:
+    return [fused_word(word, source) for word in words if confidence(word) >= MIN_SINGLE_ENGINE_CONF]
+
+
+def fuse_words(a: list, b: list, a_name: str, b_name: str) -> list:
+    """Align two engines' words for one line and vote on every difference."""
+    fused = []
+    matcher = SequenceMatcher(None, [normalized(w) for w in a], [normalized(w) for w in b], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for word_a, word_b in zip(a[i1:i2], b[j1:j2]):
+                winner = word_a if confidence(word_a) >= confidence(word_b) else word_b
+                fused.append(fused_word(winner, 'both', max(confidence(word_a), confidence(word_b))))
+        elif tag == 'replace' and i2 - i1 == j2 - j1:
+            for word_a, word_b in zip(a[i1:i2], b[j1:j2]):
+                if confidence(word_a) >= confidence(word_b):
+                    fused.append(fused_word(word_a, a_name))
+                else:
+                    fused.append(fused_word(word_b, b_name))
+        elif tag == 'replace':
+            side_a, side_b = a[i1:i2], b[j1:j2]
+            mean_a = sum(map(confidence, side_a)) / len(side_a)
+            mean_b = sum(map(confidence, side_b)) / len(side_b)
+            if mean_a >= mean_b:
+                fused.extend(fused_word(word, a_name) for word in side_a)
+            else:
+                fused.extend(fused_word(word, b_name) for word in side_b)
+        elif tag == 'delete':
+            fused.extend(single_engine_words(a[i1:i2], a_name))
+        elif tag == 'insert':
+            fused.extend(single_engine_words(b[j1:j2], b_name))
+    return fused
+
+
+def line_text(words: list) -> str:
+    return ' '.join(word['text'] for word in words)
+
+
+def layout_text(lines: list) -> str:
+    """Join fused lines, starting a paragraph at large gaps and column changes."""
+    heights = sorted(line['box'][3] - line['box'][1] for line in lines)
+    typical = heights[len(heights) // 2] if heights else 0
+    parts = []
+    previous = None
+    for line in lines:
+        if previous is not None:
+            gap = line['box'][1] - previous['box'][3]
+            new_paragraph = gap > PARAGRAPH_GAP * typical or line['box'][1] < previous['box'][1]
+            parts.append('\n\n' if new_paragraph else '\n')
+        parts.append(line['text'])
+        previous = line
+    return ''.join(parts) + '\n' if parts else ''
+
+
+def fuse_page(entries: dict, primary: str = None) -> dict:
+    """Fuse two engines' page entries into {'text', 'lines', 'words'}.
+
+    `entries` maps engine name to its page entry. The more confident
+    engine (or `primary`) sets the line order; lines only the other
+    engine found are placed after the nearest line both engines share.
+    Word boxes in the confidence map are in PDF points.
+    """
+    (a_name, a_entry), (b_name, b_entry) = entries.items()
+    a_lines, b_lines = page_lines(a_entry), page_lines(b_entry)
+    if primary is None:
+        mean = lambda lines: (sum(confidence(w) for l in lines for w in l['words'])
+                              / max(1, sum(len(l['words']) for l in lines)))
+        primary = a_name if mean(a_lines) >= mean(b_lines) else b_name
+    if primary == b_name:
+        (a_name, a_lines), (b_name, b_lines) = (b_name, b_lines), (a_name, a_lines)
+
+    matches = match_lines(a_lines, b_lines)
+    partner = {i: j for j, i in matches.items()}
+
+    # Secondary-only lines follow the primary line their predecessor matched
+    extras = {}
+    anchor = -1
+    for j, line in enumerate(b_lines):
+        if j in matches:
+            anchor = matches[j]
+        else:
+            extras.setdefault(anchor, []).append(line)
+
+    fused_lines = []
+
+    def emit(words, box):
+        if words:
+            fused_lines.append({'text': line_text(words), 'words': words, 'box': box})
+
+    for line in extras.get(-1, []):
+        emit(single_engine_words(line['words'], b_name), line['box'])
+    for i, line in enumerate(a_lines):
+        if i in partner:
+            emit(fuse_words(line['words'], b_lines[partner[i]]['words'], a_name, b_name), line['box'])
+        else:
+            emit(single_engine_words(line['words'], a_name), line['box'])
+        for extra in extras.get(i, []):
+            emit(single_engine_words(extra['words'], b_name), extra['box'])
+
+    lines = [{'text': line['text'], 'box': [round(v, 1) for v in line['box']],
+              'conf': round(sum(w['conf'] for w in line['words']) / len(line['words']), 2),
+              'words': line['words']} for line in fused_lines]
+    return {'text': layout_text(fused_lines), 'lines': lines,
+            'words': [word for line in fused_lines for word in line['words']]}
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Structured per-page OCR output for ocr_book.py
+
+Each engine's run writes one JSON record per page to ocr_<engine>_<timestamp>.jsonl:
+page number (1-based), layout label and column boxes, DPI, timing,
+page confidence, text, and lines with their boxes, confidences and
+words. Boxes are in pixels at the record's DPI (72 means PDF points).
+
+A small .idx.json next to it holds the run's metadata and every page's
+byte offset, so readers seek straight to the pages they need instead of
+re-reading and regex-splitting a whole text file. Runs that were
+interrupted before the index was written are still readable; the
+offsets are rebuilt with one scan.
+"""
+
+import os
+import json
+import glob
+from pathlib import Path
+
+
+def index_path(path) -> Path:
+    return Path(path).with_suffix('.idx.json')
+
+
+class PageRecordWriter:
+    """Appends page records to a .jsonl file and writes its index on close."""
+
+    def __init__(self, path, meta: dict = None):
+        self.path = Path(path)
+        self.meta = meta or {}
+        self.offsets = {}
+        self.f = open(self.path, 'wb')
+
+    def write(self, record: dict):
+        self.offsets[record['page']] = self.f.tell()
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+        self.f.write(line.encode('utf-8') + b'\n')
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+        index = dict(self.meta, pages={str(page): offset for page, offset in sorted(self.offsets.items())})
+        tmp_path = index_path(self.path).with_name(index_path(self.path).name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path(self.path))
+
+
+class PageRecords:
+    """Random-access reader for a page-record file.
+
+    records[12] returns page 12's record; iterating yields records in
+    page order.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            with open(index_path(self.path), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self.offsets = {int(page): offset for page, offset in index.pop('pages').items()}
+            self.meta = index
+        except (OSError, ValueError, KeyError):
+            self.offsets = self.scan()
+            self.meta = {}
+
+    def scan(self) -> dict:
+        offsets = {}
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    try:
+                        offsets[json.loads(line)['page']] = offset
+                    except (ValueError, KeyError):
+                        break  # a partly written last line
+                offset += len(line)
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, page):
+        return page in self.offsets
+
+    def pages(self) -> list:
+        return sorted(self.offsets)
+
+    def __getitem__(self, page: int) -> dict:
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[page])
+            return json.loads(f.readline())
+
+    def get(self, pages) -> list:
+        """Records for several pages, reading only those lines."""
+        records = []
+        with open(self.path, 'rb') as f:
+            for page in pages:
+                f.seek(self.offsets[page])
+                records.append(json.loads(f.readline()))
+        return records
+
+    def __iter__(self):
+        return iter(self.get(self.pages()))
+
+    def text(self, pages=None, separator: str = '\n\n') -> str:
+        """Page texts joined in page order, without any banners."""
+        return separator.join(record['text'] for record in self.get(pages or self.pages()))
+
+
+def latest_records(directory, engine: str):
+    """The newest page-record file ocr_book.py wrote for an engine, or None."""
+    files = [path for path in glob.glob(str(Path(directory) / f"ocr_{engine}_*.jsonl"))]
+    if not files:
+        return None
+    return PageRecords(max(files, key=os.path.getmtime))
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Profile the OCR correction rules one by one over the book's text files
+
+Applies each pipeline in text_processing/rules.json the plain way, one
+rule at a time in order, and records per rule how many substitutions it
+made, how many bytes it scanned and how long it took. Regexes are
+compiled as CorrectionEngine runs them, with a leading \\b moved behind
+its literal. Every rule is then checked for three problems:
+
+  dead       no substitution anywhere in the corpus
+  slow       far more time per byte than the typical rule
+  backtracks time grows faster than the text on a line made of the
+             rule's own literal (e.g. a lazy .*? or a .* lookahead that
+             rescans the line from every occurrence)
+
+The table is printed sorted by any column and can be written as CSV.
+CorrectionEngine fuses rules into shared passes, so these times are for
+the rules on their own: a guide to what to prune or rewrite.
+"""
+
+import argparse
+import csv
+import time
+from pathlib import Path
+
+from text_processing import load_file, load_rules
+from text_processing.engine import Rule
+from text_processing.rules import parse_flags
+
+DEFAULT_CORPUS = Path(__file__).parent / "00-On Attaining Buddhism" / "gemini extractions"
+
+COLUMNS = ['index', 'set', 'pattern', 'hits', 'files', 'bytes', 'seconds', 'ns_per_byte', 'growth', 'flags', 'note']
+SORT_KEYS = ['index', 'hits', 'files', 'bytes', 'seconds', 'ns_per_byte', 'growth']
+
+# A rule is slow at this many times the median time per byte
+SLOW_FACTOR = 10.0
+# Time ratio for 4x the probe text; a linear scan gives about 4, a quadratic one 16
+GROWTH_LIMIT = 8.0
+PROBE_BYTES = 20_000
+
+
+def load_corpus(corpus_dir: Path) -> list:
+    """Read every *.txt file in a directory, as the cleanup scripts would, skipping unreadable ones."""
+    texts = []
+    for path in sorted(corpus_dir.glob("*.txt")):
+        text = load_file(path)
+        if text is None:
+            print(f"Warning: skipping unreadable file: {path}")
+            continue
+        texts.append(text)
+    return texts
+
+
+def pipeline_rules(pipeline: str) -> list:
+    """A pipeline's rules in order, as dicts with their set, note and how to apply them."""
+    rules_file = load_rules()
+    rules = []
+    for name in rules_file['pipelines'][pipeline]:
+        rule_set = rules_file['sets'][name]
+        literal = rule_set.get('literal', False)
+        flags = parse_flags(rule_set.get('flags', ''))
+        for group in rule_set['groups']:
+            for rule in group['rules']:
+                pattern, replacement = rule[0], rule[1]
+                compiled = None if literal else Rule(pattern, replacement, flags)
+                rules.append({
+                    'index': len(rules),
+                    'set': name,
+                    'pattern': pattern,
+                    'replacement': replacement,
+                    'note': rule[2] if len(rule) > 2 else group.get('note', ''),
+                    'regex': None if literal else compiled.regex,
+                    'required': None if literal else compiled.required,
+                    'hits': 0, 'files': 0, 'bytes': 0, 'seconds': 0.0,
+                })
+    return rules
+
+
+def apply_rule(rule: dict, text: str):
+    """(new text, substitutions) for one rule."""
+    if rule['regex'] is None:
+        count = text.count(rule['pattern'])
+        return (text.replace(rule['pattern'], rule['replacement']) if count else text), count
+    return rule['regex'].subn(rule['replacement'], text)
+
+
+def profile(rules: list, texts: list):
+    """Run the rules in order over each text, adding up hits, bytes and time per rule."""
+    for text in texts:
+        size = len(text.encode('utf-8'))
+        for rule in rules:
+            start = time.perf_counter()
+            corrected, count = apply_rule(rule, text)
+            rule['seconds'] += time.perf_counter() - start
+            rule['bytes'] += size
+            if count:
+                rule['hits'] += count
+                rule['files'] += 1
+                if corrected != text:
+                    text = corrected
+                    size = len(text.encode('utf-8'))
+
+
+def probe_growth(rule: dict) -> float:
+    """How much longer the rule takes on 4x a line of its own literal; 0 if it has none."""
+    if not rule['required']:
+        return 0.0
+    unit = rule['required'] + ' and then '
+    line = unit * max(1, PROBE_BYTES // len(unit))
+    timings = []
+    for text in (line, line * 4):
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            rule['regex'].subn(rule['replacement'], text)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best)
+    return timings[1] / timings[0] if timings[0] else 0.0
+
+
+def assess(rules: list):
+    """Fill in time per byte, probe growth and the problem flags."""
+    for rule in rules:
+        rule['ns_per_byte'] = 1e9 * rule['seconds'] / rule['bytes'] if rule['bytes'] else 0.0
+        rule['growth'] = probe_growth(rule)
+    rates = sorted(rule['ns_per_byte'] for rule in rules)
+    median = rates[len(rates) // 2] if rates else 0.0
+    for rule in rules:
+        flags = []
+        if not rule['hits']:
+            flags.append('dead')
+        if median and rule['ns_per_byte'] > SLOW_FACTOR * median:
+            flags.append('slow')
+        if rule['growth'] > GROWTH_LIMIT:
+            flags.append('backtracks')
+        rule['flags'] = ','.join(flags)
+
+
+def print_report(pipeline: str, rules: list, sort: str, top: int):
+    total = sum(rule['seconds'] for rule in rules)
+    print(f"\n{pipeline}: {len(rules)} rules, {total:.3f}s")
+    for flag in ('dead', 'slow', 'backtracks'):
+        count = sum(1 for rule in rules if flag in rule['flags'].split(','))
+        print(f"  {flag}: {count}")
+    ordered = sorted(rules, key=lambda rule: rule[sort], reverse=sort != 'index')
+    print(f"{'#':>4} {'set':<16} {'hits':>6} {'files':>5} {'ms':>8} {'ns/B':>7} {'growth':>6}  {'flags':<16} pattern")
+    for rule in ordered[:top] if top else ordered:
+        print(f"{rule['index']:>4} {rule['set']:<16} {rule['hits']:>6} {rule['files']:>5} "
+              f"{1000 * rule['seconds']:>8.2f} {rule['ns_per_byte']:>7.2f} {rule['growth']:>6.1f}  "
+              f"{rule['flags']:<16} {rule['pattern'][:60]}")
+
+
+def write_report(path: Path, reports: dict):
+    """All pipelines' rows as CSV, one row per rule, for sorting elsewhere."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['pipeline'] + COLUMNS)
+        for pipeline, rules in reports.items():
+            for rule in rules:
+                writer.writerow([pipeline] + [rule[column] for column in COLUMNS])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the OCR correction rules one by one")
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS,
+                        help='Directory of book text files (*.txt) (default: the gemini extractions)')
+    parser.add_argument('--pipeline', action='append', choices=list(load_rules()['pipelines']),
+                        help='Pipeline to profile, may be repeated (default: all)')
+    parser.add_argument('--sort', choices=SORT_KEYS, default='seconds',
+                        help='Column to sort the printed table by (default: seconds)')
+    parser.add_argument('--top', type=int, default=25,
+                        help='Rows printed per pipeline, 0 for all (default: 25)')
+    parser.add_argument('--output', '-o', type=Path,
+                        help='Also write every rule as CSV to this file')
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    if not texts:
+        print(f"No *.txt files found in {args.corpus}")
+        return
+    print(f"Corpus: {len(texts)} files, {sum(len(text) for text in texts) / 1024:,.0f} K characters")
+
+    reports = {}
+    for pipeline in args.pipeline or load_rules()['pipelines']:
+        rules = pipeline_rules(pipeline)
+        profile(rules, texts)
+        assess(rules)
+        print_report(pipeline, rules, args.sort, args.top)
+        reports[pipeline] = rules
+
+    if args.output:
+        write_report(args.output, reports)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,14 +9,34 @@ This script creates the most accurate possible text by:
 4. Removing page artifacts and headers
 5. Producing a clean, book-quality text
 
+Each step is a generator stage over page-sized chunks of text, so the
+book is never held in memory whole and inputs of any length stream
+through. Each whole-string function below gives the same result as its
+stage on one chunk.
+
+Corrected pages are kept in a page cache (text_processing/page_cache.py)
+between runs, so after editing a page or a correction rule only the
+pages that changed are corrected again; --no-cache corrects them all, and
+--cache-dir moves it out of .cache/ at the repository root.
+
 Author: Buddhist Study Materials Project
 Date: November 2025
 """
 
 import re
+import sys
+import codecs
+import argparse
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from text_processing import PageCache, correction_engine
+from text_processing.lines import LineKind, classify_lines
+from text_processing.rules import CACHE_DIR, ENGINE_SOURCE
+from text_processing.streaming import by_line, substituted
+
 # Configuration
 BASE_DIR = Path("/Users/bonganimlambo/Documents/Code Development/Projects/Buddhist-Study-Materials/00-On Attaining Buddhism")
 OUTPUT_FILE = BASE_DIR / "FINAL_BOOK_TEXT.txt"
@@ -35,440 +55,369 @@ CHAPTERS = {
     7: "Faith for Attaining Buddhahood in This Lifetime—Advance Unerringly Along the Great Path of the Oneness of Mentor and Disciple",
 }
 
-
-def load_text(filepath: Path) -> str:
-    """Load text file with fallback encodings."""
-    for encoding in ['utf-8', 'latin-1', 'cp1252']:
-        try:
-            with open(filepath, 'r', encoding=encoding) as f:
-                return f.read()
-        except UnicodeDecodeError:
-            continue
-    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-        return f.read()
+KEY_PHRASES = [
+    "If you wish to free yourself from the sufferings of birth and death",
+    "This truth is Myoho-renge-kyo",
+    "Chanting Myoho-renge-kyo will therefore enable you to grasp the mystic truth",
+    "Even though you chant and believe in Myoho-renge-kyo",
+    "Arouse deep faith, and diligently polish your mirror day and night",
+    "The Lotus Sutra is the king of sutras",
+    "fundamental darkness",
+    "attaining Buddhahood in this lifetime",
+    "Nam-myoho-renge-kyo",
+    "Nichiren Daishonin",
+    "Soka Gakkai",
+    "oneness of mentor and disciple",
+    "human revolution",
+    "mystic truth innate in all life",
+]
+
+# Lines clean_page() blanks; lines of symbols or page numbers have no letters either
+PAGE_DEBRIS = LineKind.STRAY_LETTER | LineKind.SYMBOL_START | LineKind.NO_LETTERS
+
+# text_processing modules besides the engine that decide a cached page's result
+CACHED_CODE = ['lines.py', 'streaming.py', 'rules.py']
+
+PAGE_MARKER = re.compile(r'---\s*Page\s+(\d+)\s*---')
+MARKER_LINE = re.compile(r'---\s*Page\s+\d+\s*---\s*')
+EDITORS_NOTE = re.compile(r"Editor's\s*Note", re.IGNORECASE)
+EDITORS = re.compile(r"Editor's", re.IGNORECASE)
+
+# Applied in order over the pages joined with blank lines
+PAGE_JOIN_FIXES = [
+    (re.compile(r'\n{3,}'), '\n\n'),              # Fix multiple newlines
+    (re.compile(r'\n([,\.\;\:])'), r'\1'),        # Fix orphaned punctuation
+    (re.compile(r'(\w)-\s*\n\s*(\w)'), r'\1\2'),  # Join broken sentences
+]
+
+
+def source_encoding(filepath: Path) -> str:
+    """UTF-8 if the whole file decodes as it, else Latin-1; checked without loading the file."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                decoder.decode(block)
+        decoder.decode(b'', final=True)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def read_pages(filepath: Path):
+    """The source text in page blocks, read a line at a time.
+
+    A new block starts at a page-marker line after a blank line. The
+    corrections collapse that blank line to a space either way and
+    nothing they match runs across it, so correcting block by block gives
+    the same pages as correcting the whole text.
+    """
+    block = []
+    previous = ''
+    with open(filepath, 'r', encoding=source_encoding(filepath)) as f:
+        for line in f:
+            if block and not previous.strip() and MARKER_LINE.fullmatch(line):
+                yield ''.join(block)
+                block = []
+            block.append(line)
+            previous = line
+    if block:
+        yield ''.join(block)
+
+
+def remove_garbled_lines(text: str) -> str:
+    """Drop the lines too corrupted for the corrections to save."""
+    kept = []
+    for line, kind in zip(text.split('\n'), classify_lines(text)):
+        if kind & LineKind.ARTIFACT:
+            # Remove heavily corrupted lines (mostly symbols/garbled text)
+            kept.append('')
+        elif not kind & LineKind.GARBAGE:
+            # Remove lines that are mostly non-word characters
+            kept.append(line)
+    return '\n'.join(kept)
 
 
 def comprehensive_corrections(text: str) -> str:
     """Apply comprehensive OCR error corrections."""
+    text = remove_garbled_lines(text)
 
-    # ===== REMOVE MAJOR OCR ARTIFACTS FIRST =====
-    # Remove heavily corrupted lines (mostly symbols/garbled text)
-    text = re.sub(r'^[^\w\s]*[\-_\~\=\◄\►\▼\▲\•\♦\★\☆\○\●\□\■\△\▽\◇\◆\§\¶\†\‡\※\⁂\⁕\⁑\⁎\⁏\⁐\⁗\℗\®\©\™\℠\℡\℮\ℯ\ℰ\ℱ\Ⅻ\ⅻ\ⅿ\ↀ\ↁ\ↂ\Ↄ\ↄ\ↅ\ↆ\ↇ\ↈ]+[^\w\s]*$', '', text, flags=re.MULTILINE)
-
-    # Remove lines that are mostly non-word characters
-    def is_garbled_line(line):
-        if not line.strip():
-            return False
-        word_chars = sum(1 for c in line if c.isalnum() or c.isspace())
-        total_chars = len(line)
-        return total_chars > 5 and (word_chars / total_chars) < 0.4
-
-    lines = text.split('\n')
-    cleaned_lines = [line for line in lines if not is_garbled_line(line)]
-    text = '\n'.join(cleaned_lines)
-
-    # ===== BUDDHIST TERMINOLOGY CORRECTIONS =====
-    # These are the most critical - Buddhist names and terms
-
-    buddhist_terms = {
-        # Nichiren Daishonin variations
-        r'\bNichirend?\b': 'Nichiren',
-        r'\bNichrn\b': 'Nichiren',
-        r'\bNichran\b': 'Nichiren',
-        r'\bNicbiren\b': 'Nichiren',
-        r'\bNkbiren\b': 'Nichiren',
-        r'\bNietzsche\b(?=.*[Dd]ysonen|.*[Dd]aishonin|.*Buddhism)': 'Nichiren',  # Audio transcription error
-
-        r'\bDaysonan\b': 'Daishonin',
-        r'\bDaysonen\b': 'Daishonin',
-        r'\bDaysonin\b': 'Daishonin',
-        r'\bDayshonan\b': 'Daishonin',
-        r'\bDayshoning\b': 'Daishonin',
-        r'\bDaishonan\b': 'Daishonin',
-        r'\bDatshonin\b': 'Daishonin',
-        r'\bDaisbonin\b': 'Daishonin',
-        r'\bDysonen\b': 'Daishonin',
-
-        # Nam-myoho-renge-kyo variations
-        r'\bNam-myohoringa\s+Kyol?\b': 'Nam-myoho-renge-kyo',
-        r'\bNam-Myoho-Renge-Kyo\b': 'Nam-myoho-renge-kyo',
-        r'\bNam-myoho-renge-Kyo\b': 'Nam-myoho-renge-kyo',
-        r'\bNam-myoho\s+renge\s+kyo\b': 'Nam-myoho-renge-kyo',
-        r'\bNamyoho-renge-kyo\b': 'Nam-myoho-renge-kyo',
-        r'\bNam Yoho\b': 'Nam-myoho',
-        r'\bNam Yohorenga\b': 'Nam-myoho-renge',
-        r'\bN=\s*myohu-renge-kyo\b': 'Nam-myoho-renge-kyo',
-
-        # Myoho-renge-kyo variations
-        r'\bMyhorengeol\b': 'Myoho-renge-kyo',
-        r'\bMyohoringe\b': 'Myoho-renge-kyo',
-        r'\bMyohoring\b': 'Myoho-renge-kyo',
-        r'\bMiohoringo\b': 'Myoho-renge-kyo',
-        r'\bMiohorengeol\b': 'Myoho-renge-kyo',
-        r'\bMyo\s+Horengeo\b': 'Myoho-renge-kyo',
-        r'\bmyhorengeol\b': 'Myoho-renge-kyo',
-        r'\bmyhorengeo\b': 'Myoho-renge-kyo',
-        r'\bllohorenge-kyo\b': 'Myoho-renge-kyo',
-        r'\bMyoho-renge-l\'yo\b': 'Myoho-renge-kyo',
-        r'\bMyoho-raige-kyo\b': 'Myoho-renge-kyo',
-        r'\bM}\'oho-rmge-l\'yo\b': 'Myoho-renge-kyo',
-        r'\bMyoho-reng,...\s*kyo\b': 'Myoho-renge-kyo',
-
-        # Other Buddhist terms
-        r'\bBuddhahhod\b': 'Buddhahood',
-        r'\bBtiddhahood\b': 'Buddhahood',
-        r'\bBuddbahcwf\b': 'Buddhahood',
-        r'\bBuJdhahood\b': 'Buddhahood',
-        r'\bBuJJhahood\b': 'Buddhahood',
-        r'\bBnddhahood\b': 'Buddhahood',
-        r'\bRnddb!st\b': 'Buddhist',
-        r'\bBudJ.h.l\b': 'Buddha',
-        r'\bBuJJha\b': 'Buddha',
-        r'\bBuddbahond\b': 'Buddhahood',
-
-        r'\bShalyamuni\b': 'Shakyamuni',
-        r'\bShJkyamunl\b': 'Shakyamuni',
-        r'\bShJkyamuni\b': 'Shakyamuni',
-
-        r'\bGonggyo\b': 'Gongyo',
-        r'\bGakai\b': 'Gakkai',
-        r'\bGak.kai\b': 'Gakkai',
-        r'\bSaka\b(?=\s+University)': 'Soka',
-        r'\bSaka\b(?=\s+Gakkai)': 'Soka',
-
-        r'\bLotuS\b': 'Lotus',
-        r'\blotw\b': 'Lotus',
-        r'\bLotui\b': 'Lotus',
-        r'\bl otw\b': 'Lotus',
-        r'\bl otus\b': 'Lotus',
-
-        r'\bSurr\.1\b': 'Sutra',
-        r'\bSutr,1\b': 'Sutra',
-        r'\bS111ra\b': 'Sutra',
-        r'\bSMlnll\b': 'Sutras',
-
-        r'\bDharma\b': 'Dharma',
-
-        # WND references
-        r'\(wwp-1\b': '(WND-1',
-        r'\(WwND-1\b': '(WND-1',
-        r'\(WNO-I\b': '(WND-1',
-        r'\(WNO\.\s*I\b': '(WND-1',
-        r'\(WND-7\b': '(WND-1',
-        r'\(\\,VND-1\b': '(WND-1',
-        r'\(/\\IWD-1\b': '(WND-1',
-        r'WND-\s*1': 'WND-1',
-    }
-
-    for pattern, replacement in buddhist_terms.items():
-        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE if replacement.lower() == replacement else 0)
-
-    # ===== OCR ARTIFACT CORRECTIONS =====
-    ocr_fixes = {
-        # Common OCR errors
-        r'm\.-plen&nt': 'resplendent',
-        r'rc\\\'olutionary': 'revolutionary',
-        r'a\\.-complishing': 'accomplishing',
-        r'<:hanged': 'changed',
-        r'prac&--e': 'practice',
-        r',icwed': 'viewed',
-        r'practidng': 'practicing',
-        r'higho1': 'highest',
-        r'ronswn\.': 'constant,',
-        r'~un': 'between',
-        r'all\°"ing': 'allowing',
-        r'oursel\\-es': 'ourselves',
-        r'b\)\'': 'by',
-        r'darknes\'S': 'darkness',
-        r'onaasing\s*_\.\.\s*1fort': 'unceasing effort',
-        r'~\s*of': 'essence of',
-        r'dnrkncss': 'darkness',
-        r'l\\cgativity': 'negativity',
-        r'signi6cant': 'significant',
-        r'50lll\'ce': 'source',
-        r'bunwikind': 'humankind',
-        r'tb,rc': 'there',
-        r'livuig': 'living',
-        r'bcms': 'beings',
-        r'nfA1': 'next',
-        r'prarti\.\.-e': 'practice',
-        r'mn<asing': 'unceasing',
-        r'1n other': 'In other',
-        r'th\.ough': 'through',
-        r'\'OUr': 'your',
-        r'-\.iew': 'view',
-        r'J\.1i': 'dai',
-        r'\.shine': 'Daishonin',
-
-        # Word breaks and hyphenation
-        r'acti-\s*~?\s*vate': 'activate',
-        r'acti-\s*vate': 'activate',
-        r'mani-\s*fests': 'manifests',
-        r'enlight-\s*enment': 'enlightenment',
-        r'Bud-\s*dha': 'Buddha',
-        r'ordi-\s*nary': 'ordinary',
-        r'peo-\s*ple': 'people',
-        r'trans-\s*migrate': 'transmigrate',
-        r'trans-\s*migra-\s*tion': 'transmigration',
-        r'hu-\s*man': 'human',
-        r'reli-\s*gion': 'religion',
-        r'enlight-\s*en-\s*ment': 'enlightenment',
-        r'estab-\s*lished': 'established',
-        r'prac-\s*tice': 'practice',
-        r'spiri-\s*tual': 'spiritual',
-        r'nega-\s*tive': 'negative',
-        r'destruc-\s*tive': 'destructive',
-        r'convic-\s*tion': 'conviction',
-        r'spon-\s*ta-\s*neously': 'spontaneously',
-        r'for-\s*mu-\s*lating': 'formulating',
-
-        # Spacing issues
-        r'\s{2,}': ' ',
-        r'lt\s+means': 'It means',
-        r'\bi\s+believe': 'I believe',
-        r'\bi\s+will': 'I will',
-        r'\bi\s+look': 'I look',
-        r"I\s*'ll": "I'll",
-        r"Pll": "I'll",
-
-        # Punctuation
-        r'\s+\.': '.',
-        r'\s+,': ',',
-        r'\s+;': ';',
-        r'\s+:': ':',
-        r',,': ',',
-        r'\.\.': '.',
-
-        # Common typos from audio transcription
-        r'\bpray\b(?=\s+for|\s+to|\s+that)': 'pray',  # keep correct pray
-        r'\basage\b': 'assuage',
-        r'\bbreak\b(?=\s+through\s+the\s+darkness)': 'break',  # keep correct break
-
-        # Garbled characters
-        r'[ᥥ]+': '',
-        r'f#,\.\.\s*\.---.*?---\s*': ' ',
-        r'◄\s*': '',
-        r'•\s*': '',
-        r'~\s*(?=[A-Z])': '',
-
-        # Page markers/artifacts to clean (keep page numbers clean)
-        r'^---\s*Page\s+\d+\s*---$': '',  # Will handle these specially
-        r'^\d+$': '',  # Solo page numbers on their own line
-
-        # Headers to remove
-        r'^On Attaining Buddhahood in This Lifetime$': '',  # Page header repeats
-        r'^SGI President Ikeda\'s Lecture Series$': '',
-
-        # Additional OCR garbage patterns
-        r'yaa wim tD me JUIH idf': 'you wish to free yourself',
-        r'e@HMecl simztime wilhout': 'endured since time without',
-        r'rmgl,trnnml in dlidifdio~': 'enlightenment in this lifetime,',
-        r'origimllf inhesn11 iaalltiringbrinp': 'originally inherent in all living beings',
-        r'r0a AtlaiaiaglacMbeboocl': '("On Attaining Buddhahood',
-        r'coostibrtes a cleeply rntaningful': 'constitutes a deeply meaningful',
-        r'bappinew\. Nx:hirm lluddbivn': 'happiness. Nichiren Buddhism',
-        r'ttaching of hope that enabla 11&': 'teaching of hope that enables us',
-        r'UDS1l1\'pused': 'unsurpassed',
-        r'wne\.': 'same.',
-        r'asiured': 'assured',
-        r'cnlightenmenL': 'enlightenment.',
-        r'e:ci\.sts': 'exists',
-        r'hwnanity': 'humanity',
-        r'\\,VND': 'WND',
-        r'\\Ve\'ll': "We'll",
-        r'/\\IWD': 'WND',
-        r'Myohorenge-kyo': 'Myoho-renge-kyo',
-        r'Nammyoho-renge-kyo': 'Nam-myoho-renge-kyo',
-        r'Nammyoho-rengekyo': 'Nam-myoho-renge-kyo',
-        r'Nam-myohorenge-kyo': 'Nam-myoho-renge-kyo',
-        r'lkedas': "Ikeda's",
-        r'011 Attaining': 'On Attaining',
-        r'Buddhal1ood': 'Buddhahood',
-        r'i\'ifetime': 'Lifetime',
-        r'profou7ld': 'profound',
-        r'attaini~g': 'attaining',
-        r'B11ddhahood': 'Buddhahood',
-        r'irl this': 'in this',
-        r'cm, powerfully': 'can powerfully',
-        r'tran~fom1': 'transform',
-        r'modem': 'modern',
-        r'bis day': 'his day',
-        r'peo-\s*ple': 'people',
-        r'nfA1 time': 'next time',
-    }
-
-    for pattern, replacement in ocr_fixes.items():
-        text = re.sub(pattern, replacement, text, flags=re.MULTILINE)
+    # ===== BUDDHIST TERMINOLOGY AND OCR ARTIFACT CORRECTIONS =====
+    # buddhist_terms then ocr_fixes, from text_processing/rules.json
+    text = correction_engine('synthesis').apply(text)
 
     return text
 
 
-def clean_structure(text: str) -> str:
-    """Clean document structure and formatting."""
-
-    # Remove page markers but keep content organized
-    # First, split by page markers
-    pages = re.split(r'---\s*Page\s+(\d+)\s*---', text)
-
-    # Reconstruct without markers
-    cleaned_content = []
-
-    i = 0
-    while i < len(pages):
-        content = pages[i].strip()
-        if content and not content.isdigit():
-            # Remove common OCR artifacts at start of pages
-            content = re.sub(r'^[\s\.\,\'\"\*\•\~\-\_\=]+', '', content)
-            # Remove stray characters
-            content = re.sub(r'^[a-z]\s*$', '', content, flags=re.MULTILINE)
-            # Remove garbled lines
-            content = re.sub(r'^[^\w\s]{3,}.*$', '', content, flags=re.MULTILINE)
-            content = re.sub(r'^[\s\.\,\'\"\*\•\~\-\=\◄\►\►\▼\▲]+$', '', content, flags=re.MULTILINE)
-            # Remove lines that are mostly symbols
-            content = re.sub(r'^[^a-zA-Z]*$', '', content, flags=re.MULTILINE)
-
-            if content.strip():
-                cleaned_content.append(content)
-        i += 1
-
-    # Join with proper spacing
-    text = '\n\n'.join(cleaned_content)
+def corrected_pages(blocks):
+    for block in blocks:
+        yield comprehensive_corrections(block)
+
+
+def clean_page(content: str) -> str:
+    """One page's text without page-level OCR debris; '' if nothing is left."""
+    content = content.strip()
+    if not content or content.isdigit():
+        return ''
+    # Remove common OCR artifacts at start of pages
+    content = re.sub(r'^[\s\.\,\'\"\*\•\~\-\_\=]+', '', content)
+    # Blank stray characters, garbled lines and lines without letters
+    lines = content.split('\n')
+    for i, kind in enumerate(classify_lines(content)):
+        if kind & PAGE_DEBRIS:
+            lines[i] = ''
+    content = '\n'.join(lines)
+    return content if content.strip() else ''
+
+
+def page_contents(blocks):
+    """Cleaned page texts, split at the page markers left after correction."""
+    for block in blocks:
+        for part in PAGE_MARKER.split(block):
+            content = clean_page(part)
+            if content:
+                yield content
+
+
+def chapter_opening(title: str):
+    """A line opening with a chapter's title, however the OCR broke or punctuated it.
+
+    The first four words must share a line; the rest may wrap.
+    """
+    words = [re.escape(word) for word in re.findall(r'\w+', title)[:8]]
+    words[0] = f'(?i:{words[0][0]}){words[0][1:]}'
+    return re.compile(r'^[^\w\n]*' + r'[^\w\n]+'.join(words[:4]) + ''.join(r'\W+' + word for word in words[4:]),
+                      re.MULTILINE)
+
+
+def chapter_shards(blocks):
+    """The page blocks grouped by chapter, in order.
+
+    A chapter starts at the first later page opening with its title. A
+    page naming several chapters is the contents, and a chapter whose
+    opening is never found stays with the one before. Pages are
+    corrected one by one, so the grouping only decides how the work is
+    shared out, never the text.
+    """
+    openings = [chapter_opening(title) for title in CHAPTERS.values()]
+    shard = []
+    for block in blocks:
+        found = [i for i, opening in enumerate(openings) if opening.search(block)]
+        if len(found) == 1:
+            del openings[:found[0] + 1]
+            if shard:
+                yield shard
+                shard = []
+        shard.append(block)
+    if shard:
+        yield shard
+
+
+def shard_pages(shard: list) -> list:
+    """Cleaned page texts of one chapter's blocks, in a worker process."""
+    return list(page_contents(corrected_pages(shard)))
+
+
+def parallel_pages(blocks, workers: int):
+    """page_contents(corrected_pages(blocks)), a chapter per worker process.
+
+    Results are yielded in chapter order, whichever worker finishes first.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for contents in pool.map(shard_pages, chapter_shards(blocks)):
+            yield from contents
+
+
+def cached_pages(blocks, cache: PageCache):
+    """page_contents(corrected_pages(blocks)), reusing the pages the cache still has."""
+    for block in blocks:
+        yield from cache.lookup(block, remove_garbled_lines, lambda text: list(page_contents([text])))
+
+
+def fix_page_joins(text: str) -> str:
+    for regex, replacement in PAGE_JOIN_FIXES:
+        text = regex.sub(replacement, text)
+    return text
 
-    # Fix multiple newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
 
-    # Fix orphaned punctuation
-    text = re.sub(r'\n([,\.\;\:])', r'\1', text)
+def join_cut(text: str) -> int:
+    """The last place PAGE_JOIN_FIXES cannot match across, or 0.
+
+    Every pair of neighbouring characters in their matches has a
+    whitespace character or a hyphen, so text can be split between two
+    characters that are neither and fixed in two parts.
+    """
+    for pos in range(len(text) - 1, 0, -1):
+        before, after = text[pos - 1], text[pos]
+        if not (before.isspace() or after.isspace() or before == '-' or after == '-'):
+            return pos
+    return 0
+
+
+def joined_pages(contents):
+    """The page texts joined with blank lines, fixed across the joins and stripped.
+
+    Each page is held back from its last safe split point, so only a word
+    or so carries over into the next page.
+    """
+    carry = None
+    started = False
+    for content in contents:
+        carry = content if carry is None else carry + '\n\n' + content
+        cut = join_cut(carry)
+        if not cut:
+            continue
+        text, carry = fix_page_joins(carry[:cut]), carry[cut:]
+        if not started:
+            text = text.lstrip()
+            started = bool(text)
+        if text:
+            yield text
+    if carry is not None:
+        text = fix_page_joins(carry).rstrip()
+        yield text if started else text.lstrip()
 
-    # Join broken sentences
-    text = re.sub(r'(\w)-\s*\n\s*(\w)', r'\1\2', text)
 
-    return text.strip()
+def clean_structure(text: str) -> str:
+    """Clean document structure and formatting."""
+    return ''.join(joined_pages(page_contents([text])))
+
+
+def from_editors_note(chunks):
+    """The text from Editor's Note onward; all of it if there is none.
+
+    Chunks are held until the heading turns up, so the front matter is
+    the most this stage keeps in memory.
+    """
+    chunks = iter(chunks)
+    buffer = ''
+    resume = 0
+    for chunk in chunks:
+        # A match the new chunk completes starts at the buffer's last "Editor's"
+        # (only whitespace and part of "Note" can follow it) or in its last
+        # few characters; no match starts before the last resume point
+        heading = None
+        for heading in EDITORS.finditer(buffer, resume):
+            pass
+        resume = max(0, len(buffer) - len("Editor's") + 1)
+        if heading:
+            resume = min(resume, heading.start())
+        buffer += chunk
+        match = EDITORS_NOTE.search(buffer, resume)
+        if match:
+            yield buffer[match.start():]
+            yield from chunks
+            return
+    yield buffer
 
 
 def remove_front_matter(text: str) -> str:
     """Remove or format front matter (title page, copyright, etc.)."""
+    return ''.join(from_editors_note([text]))
 
-    # Find where actual content begins (after Editor's Note)
-    editor_note_match = re.search(r"Editor's\s*Note", text, re.IGNORECASE)
-
-    if editor_note_match:
-        # Keep from Editor's Note onward
-        text = text[editor_note_match.start():]
-
-    return text
-
-
-def format_chapter_headers(text: str) -> str:
-    """Properly format chapter headers."""
-
-    # Chapter patterns to identify
-    chapter_patterns = [
-        r'\[(\d+)\]',  # [1], [2], etc.
-        r'\((\d+)\)',  # (1), (2), etc.
-        r'Chapter\s+(\d+)',
-    ]
 
+def chapter_headers(chunks):
     for i, title in CHAPTERS.items():
         # Look for chapter indicators and ensure proper formatting
-        text = re.sub(
+        chunks = substituted(
+            chunks,
             rf'\[{i}\]\s*\n*({re.escape(title[:30])})',
             f'\n\n{"="*70}\nCHAPTER {i}\n{title}\n{"="*70}\n\n',
-            text,
             flags=re.IGNORECASE
         )
+    return chunks
 
-    return text
 
+def format_chapter_headers(text: str) -> str:
+    """Properly format chapter headers."""
+    return ''.join(chapter_headers([text]))
 
-def final_polish(text: str) -> str:
-    """Final polish and quality checks."""
 
+def polished(chunks):
     # Ensure proper spacing around quotes
-    text = re.sub(r'"\s+', '" ', text)
-    text = re.sub(r'\s+"', ' "', text)
+    chunks = substituted(chunks, r'"\s+', '" ')
+    chunks = substituted(chunks, r'\s+"', ' "')
 
     # Fix common remaining issues
-    text = re.sub(r'\s+\'s\b', "'s", text)
-    text = re.sub(r'\s+n\'t\b', "n't", text)
+    chunks = substituted(chunks, r'\s+\'s\b', "'s")
+    chunks = substituted(chunks, r'\s+n\'t\b', "n't")
 
     # Ensure single space after periods (except abbreviations)
-    text = re.sub(r'\.  +', '. ', text)
+    chunks = substituted(chunks, r'\.  +', '. ')
 
     # Remove trailing whitespace
-    text = '\n'.join(line.rstrip() for line in text.split('\n'))
+    return by_line(chunks, str.rstrip)
 
-    return text
 
+def final_polish(text: str) -> str:
+    """Final polish and quality checks."""
+    return ''.join(polished([text]))
 
-def verify_key_phrases(text: str) -> dict:
-    """Verify presence of key phrases from the book."""
 
-    key_phrases = [
-        "If you wish to free yourself from the sufferings of birth and death",
-        "This truth is Myoho-renge-kyo",
-        "Chanting Myoho-renge-kyo will therefore enable you to grasp the mystic truth",
-        "Even though you chant and believe in Myoho-renge-kyo",
-        "Arouse deep faith, and diligently polish your mirror day and night",
-        "The Lotus Sutra is the king of sutras",
-        "fundamental darkness",
-        "attaining Buddhahood in this lifetime",
-        "Nam-myoho-renge-kyo",
-        "Nichiren Daishonin",
-        "Soka Gakkai",
-        "oneness of mentor and disciple",
-        "human revolution",
-        "mystic truth innate in all life",
-    ]
-
-    results = {}
-    for phrase in key_phrases:
-        found = phrase.lower() in text.lower()
-        results[phrase] = found
-
-    return results
-
-
-def create_final_text():
-    """Main function to create the final synthesized text."""
+def synthesized_text(filepath: Path, cache: PageCache = None, workers: int = 1):
+    """The synthesized book text from a source file, as a stream of chunks.
 
-    print("=" * 70)
-    print("FINAL TEXT SYNTHESIS")
-    print("On Attaining Buddhahood in This Lifetime")
-    print("=" * 70)
+    With workers > 1 the pages are corrected a chapter per process,
+    without the cache; the stages after that run here, in page order,
+    so the text is the same either way.
+    """
+    chunks = read_pages(filepath)
+    if workers > 1:
+        chunks = parallel_pages(chunks, workers)
+    elif cache is not None:
+        chunks = cached_pages(chunks, cache)
+    else:
+        chunks = page_contents(corrected_pages(chunks))
+    chunks = joined_pages(chunks)
+    chunks = from_editors_note(chunks)
+    chunks = chapter_headers(chunks)
+    return polished(chunks)
 
-    # Load primary source
-    print("\n1. Loading primary source (gemini_full.txt)...")
-    text = load_text(PRIMARY_SOURCE)
-    print(f"   Loaded {len(text):,} characters")
 
-    # Apply comprehensive corrections
-    print("\n2. Applying OCR error corrections...")
-    text = comprehensive_corrections(text)
-    print("   Applied Buddhist terminology fixes")
-    print("   Applied OCR artifact corrections")
+class PhraseCheck:
+    """Which KEY_PHRASES a stream of text contains, fed a chunk at a time."""
 
-    # Clean structure
-    print("\n3. Cleaning document structure...")
-    text = clean_structure(text)
-    print("   Removed page markers and artifacts")
+    def __init__(self, phrases=KEY_PHRASES):
+        self.phrases = {phrase: phrase.lower() for phrase in phrases}
+        self.overlap = max(len(phrase) for phrase in phrases) - 1
+        self.found = set()
+        self.tail = ''
 
-    # Remove/format front matter
-    print("\n4. Formatting document...")
-    text = remove_front_matter(text)
-    text = format_chapter_headers(text)
-    text = final_polish(text)
+    def feed(self, chunk: str):
+        text = self.tail + chunk.lower()
+        self.found.update(phrase for phrase, lowered in self.phrases.items() if lowered in text)
+        self.tail = text[-self.overlap:] if self.overlap else ''
 
-    # Verify key phrases
-    print("\n5. Verifying key phrases...")
-    verification = verify_key_phrases(text)
-    passed = sum(1 for v in verification.values() if v)
-    total = len(verification)
-    print(f"   {passed}/{total} key phrases verified")
+    def results(self) -> dict:
+        return {phrase: phrase in self.found for phrase in self.phrases}
 
-    for phrase, found in verification.items():
-        status = "✓" if found else "✗"
-        print(f"   {status} {phrase[:50]}...")
+
+def verify_key_phrases(text: str) -> dict:
+    """Verify presence of key phrases from the book."""
+    check = PhraseCheck()
+    check.feed(text)
+    return check.results()
+
+
+def page_cache(cache_dir=CACHE_DIR) -> PageCache:
+    """The synthesis page cache; editing this script or the code it corrects pages with starts it afresh."""
+    sources = [Path(__file__), ENGINE_SOURCE] + [ENGINE_SOURCE.with_name(name) for name in CACHED_CODE]
+    salt = b''.join(source.read_bytes() for source in sources) + sys.version.encode()
+    return PageCache('synthesis', salt, cache_dir=cache_dir)
+
+
+def create_final_text(use_cache: bool = True, workers: int = 1, cache_dir=CACHE_DIR):
+    """Main function to create the final synthesized text.
+
+    The text is streamed to OUTPUT_FILE rather than built in memory, so
+    this returns its statistics, a dict of characters, words, lines and
+    key_phrases (phrase -> found), not the text itself as it used to.
+    """
+
+    print("=" * 70)
+    print("FINAL TEXT SYNTHESIS")
+    print("On Attaining Buddhahood in This Lifetime")
+    print("=" * 70)
 
     # Create output
     output = []
@@ -485,20 +434,51 @@ def create_final_text():
     output.append("=" * 70)
     output.append("")
     output.append("")
-    output.append(text)
+    header = '\n'.join(output) + '\n'
+
+    # Stream the pipeline to the output file
+    print("\n1. Streaming primary source (gemini_full.txt) page by page...")
+    print("   Applying Buddhist terminology fixes and OCR artifact corrections")
+    print("   Removing page markers and artifacts, formatting chapters")
+
+    cache = page_cache(cache_dir) if use_cache and workers <= 1 else None
+    check = PhraseCheck()
+    total_chars = word_count = 0
+    line_count = 1
+    in_word = False
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        for chunk in chain([header], synthesized_text(PRIMARY_SOURCE, cache, workers)):
+            if not chunk:
+                continue
+            f.write(chunk)
+            check.feed(chunk)
+            total_chars += len(chunk)
+            line_count += chunk.count('\n')
+            words = len(chunk.split())
+            if words and in_word and not chunk[0].isspace():
+                words -= 1  # a word split between chunks
+            word_count += words
+            in_word = not chunk[-1].isspace()
+
+    if cache is not None:
+        cache.save()
+        print(f"   Reused {cache.reused} pages from the page cache, corrected {cache.corrected}")
 
-    final_text = '\n'.join(output)
+    # Verify key phrases
+    print("\n2. Verifying key phrases...")
+    verification = check.results()
+    passed = sum(1 for v in verification.values() if v)
+    total = len(verification)
+    print(f"   {passed}/{total} key phrases verified")
 
-    # Write output
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        f.write(final_text)
+    for phrase, found in verification.items():
+        status = "✓" if found else "✗"
+        print(f"   {status} {phrase[:50]}...")
 
-    print(f"\n6. Output saved to: {OUTPUT_FILE}")
-    print(f"   Total characters: {len(final_text):,}")
+    print(f"\n3. Output saved to: {OUTPUT_FILE}")
+    print(f"   Total characters: {total_chars:,}")
 
     # Statistics
-    word_count = len(final_text.split())
-    line_count = len(final_text.split('\n'))
     print(f"   Word count: {word_count:,}")
     print(f"   Line count: {line_count:,}")
 
@@ -506,8 +486,21 @@ def create_final_text():
     print("SYNTHESIS COMPLETE")
     print("=" * 70)
 
-    return final_text
+    return {'characters': total_chars, 'words': word_count, 'lines': line_count,
+            'key_phrases': verification}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesize the final book text from the primary OCR source")
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Correct every page again instead of reusing unchanged pages')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Processes correcting pages, a chapter each; bypasses the page cache (default: 1)')
+    parser.add_argument('--cache-dir', type=Path, default=CACHE_DIR,
+                        help=f'Directory for the page cache (default: {CACHE_DIR})')
+    args = parser.parse_args()
+    create_final_text(use_cache=not args.no_cache, workers=args.workers, cache_dir=args.cache_dir)
 
 
 if __name__ == '__main__':
-    create_final_text()
+    main()
@@ -0,0 +1,79 @@
+"""
+Manifest crawls against bench_collect's local stand-in server, offline
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import collect_chapters  # noqa: E402
+from bench_collect import ChapterStandIn  # noqa: E402
+
+BOOKS = [
+    {
+        "id": "titled",
+        "index_url": "{base_url}/titled/index.html",
+        "url_template": "{base_url}/titled/{filename}",
+        "chapter_pattern": r"/titled/chapter-\d+\.html$",
+        "output_dir": "titled",
+        "title_formats": {r"chapter-(\d+)\.html": "Section {1} - {text}"},
+        "titles": {"chapter-2.html": "Section 2 - The Verified Title"},
+    },
+    {
+        "id": "plain",
+        "index_url": "{base_url}/plain/index.html",
+        "url_template": "{base_url}/plain/{filename}",
+        "chapter_pattern": r"/plain/chapter-\d+\.html$",
+        "output_dir": "plain",
+    },
+]
+
+
+def crawl(output):
+    with ChapterStandIn(chapters=3) as stand_in:
+        fetcher = collect_chapters.Fetcher(per_host=2, rate=0)
+        try:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                runs = collect_chapters.crawl(BOOKS, str(output), fetcher, pool,
+                                              base_url=stand_in.base_url, verbose=False)
+        finally:
+            fetcher.close()
+    return runs
+
+
+def saved(output):
+    return {path.relative_to(output).as_posix(): path.read_text(encoding='utf-8')
+            for path in sorted(output.rglob('*.txt'))}
+
+
+def test_titles_come_from_the_manifest(tmp_path):
+    runs = crawl(tmp_path)
+
+    assert [(run.book_id, run.success_count, run.error_count) for run in runs] == \
+        [('titled', 3, 0), ('plain', 3, 0)]
+    files = saved(tmp_path)
+    assert sorted(files) == [f"{book}/chapter-{i}.txt" for book in ('plain', 'titled') for i in (1, 2, 3)]
+    assert [files[f"titled/chapter-{i}.txt"].split('\n', 1)[0] for i in (1, 2, 3)] == \
+        ['Section 1 - Chapter 1', 'Section 2 - The Verified Title', 'Section 3 - Chapter 3']
+    assert [files[f"plain/chapter-{i}.txt"].split('\n', 1)[0] for i in (1, 2, 3)] == \
+        ['Chapter 1', 'Chapter 2', 'Chapter 3']
+
+
+def test_rerun_writes_the_same_files(tmp_path):
+    crawl(tmp_path / 'first')
+    crawl(tmp_path / 'second')
+
+    assert saved(tmp_path / 'first') == saved(tmp_path / 'second')
+
+
+def test_wisdom_keeps_its_verified_titles():
+    wisdom = collect_chapters.load_manifest()['books'][0]
+
+    assert collect_chapters.chapter_title(wisdom, 'chapter-1-1.html', 'Anything') == \
+        'Chapter 1.1 - Leading the Happiest of Lives'
+    assert collect_chapters.chapter_title(wisdom, 'chapter-40-2.html', 'A New Section') == \
+        'Chapter 40.2 - A New Section'
+    assert collect_chapters.chapter_title(wisdom, 'conclusion-8.html', 'Onward') == 'Conclusion 8 - Onward'
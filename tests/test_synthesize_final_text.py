@@ -0,0 +1,37 @@
+"""
+Streamed synthesis stages against their whole-text versions
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import synthesize_final_text as synthesis  # noqa: E402
+
+FRONT_MATTER = [
+    "Title page\nCopyright 2011\n\nEditor's Note\n\nThis book collects lectures.\n",
+    "Title\n\nEDITOR'S \n\n  NOTE\nText after the heading.\n",
+    "Editor's Note first\n",
+    "An editor's aside, then Editor's Note.\n",
+    "No heading in this text at all.\n",
+]
+
+
+@pytest.mark.parametrize('text', FRONT_MATTER)
+def test_from_editors_note_matches_whole_text_at_every_split(text):
+    expected = synthesis.remove_front_matter(text)
+    for cut in range(len(text) + 1):
+        assert ''.join(synthesis.from_editors_note([text[:cut], text[cut:]])) == expected, cut
+
+
+@pytest.mark.parametrize('text', FRONT_MATTER[:2])
+def test_from_editors_note_matches_whole_text_in_three_chunks(text):
+    expected = synthesis.remove_front_matter(text)
+    for first in range(len(text) + 1):
+        for second in range(first, len(text) + 1):
+            chunks = [text[:first], text[first:second], text[second:]]
+            assert ''.join(synthesis.from_editors_note(chunks)) == expected, (first, second)
@@ -0,0 +1,87 @@
+"""
+Paragraph merge checks on the repository's own sources for On Attaining Buddhahood
+
+The merge must never duplicate FINAL_VERIFIED's text or substitute it
+bar garbled paragraphs, and must keep everything around the chapter
+paragraphs as it is.
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import validate_and_merge_ocr as merge  # noqa: E402
+
+BOOK_DIR = ROOT / "00-On Attaining Buddhism"
+SOURCES = {name: BOOK_DIR / Path(path).relative_to(merge.BASE_DIR) for name, path in merge.SOURCES.items()}
+
+pytestmark = pytest.mark.skipif(not SOURCES['final_verified'].exists(), reason="book sources not checked out")
+
+
+@pytest.fixture(scope='module')
+def loaded():
+    return {
+        'final_verified': merge.load_verified_text(SOURCES['final_verified']),
+        'true_version': merge.load_verified_text(SOURCES['true_version']),
+        'audio_transcript': merge.extract_audio_transcript_text(SOURCES['audio_transcript']),
+        'surya': merge.load_surya_output(SOURCES['surya_combined'].parent),
+        'tesseract': merge.load_tesseract_pages(SOURCES['tesseract_pages']),
+    }
+
+
+def test_final_verified_is_kept_but_for_artifact_paragraphs(loaded):
+    document = loaded['final_verified']['full']
+    text, provenance = merge.merge_sources(loaded, workers=1)
+
+    dropped = [entry for entry in provenance if entry['source'] is None]
+    assert {entry['source'] for entry in provenance} == {'final_verified', None}
+    assert merge.split_paragraphs(text) == \
+        [paragraph for paragraph in merge.split_paragraphs(document) if not merge.unreadable(paragraph)]
+    assert len(merge.split_paragraphs(document)) - len(merge.split_paragraphs(text)) == len(dropped)
+    # The other sources were still aligned, so the provenance says where they agree
+    assert any(entry['aligned'] for entry in provenance)
+
+
+def test_garbled_verified_paragraphs_take_the_agreed_reading():
+    spine = ['The first paragraph is here and it reads well enough.',
+             'Whoever chants the daimoku\n~=§¶#=~§\nshall attain.',
+             '©',
+             'The last paragraph closes the chapter.']
+    reading = ['The first paragraph is here and it reads well enough.',
+               'Whoever chants the daimoku in this way shall attain.',
+               'The last paragraph ends this chapter.']
+    merge.share_indexes({})
+    _, merged, provenance = merge.merge_chapter(
+        (1, 'final_verified', spine, {'true_version': reading, 'audio_transcript': reading}))
+
+    assert merged == [spine[0], reading[1], None, spine[3]]
+    assert [entry['source'] for entry in provenance] == ['final_verified', 'true_version', None, 'final_verified']
+    assert [entry.get('disputed') for entry in provenance] == [None, None, None, 'true_version']
+
+
+def test_unverified_primary_gains_no_duplicates(loaded):
+    sources = {name: value for name, value in loaded.items() if name != 'final_verified'}
+    document = sources['true_version']['full']
+    text, provenance = merge.merge_sources(sources, workers=1)
+
+    before = Counter(merge.split_paragraphs(document))
+    after = Counter(merge.split_paragraphs(text))
+    assert not [paragraph for paragraph, count in after.items() if count > before[paragraph]]
+    assert [m.group() for m in merge.CHAPTER_MARKER.finditer(text)] == \
+        [m.group() for m in merge.CHAPTER_MARKER.finditer(document)]
+    for entry in provenance:
+        assert entry['source'] == 'true_version' or entry['source'] in entry['aligned']
+
+
+def test_rebuild_keeps_text_outside_chapters():
+    document = "Front matter\n\n--- Chapter 1 ---\nOne.\n\nTwo.\n--- Chapter 1 (Part 2) ---\n\nThree.\n\nAfterword"
+    merged = {1: ['One!', 'Two.', 'Three.', 'Afterword'], 3: ['Added.']}
+
+    assert merge.rebuild_document(document, merged) == (
+        "Front matter\n\n--- Chapter 1 ---\nOne!\n\nTwo.\n--- Chapter 1 (Part 2) ---\n\nThree.\n\nAfterword"
+        "\n\n--- Chapter 3 ---\nAdded.\n\n")
@@ -0,0 +1,29 @@
+"""
+Text helpers shared by the cleanup and comparison scripts
+
+    from text_processing import correction_engine, load_file
+
+    text = load_file(path)
+    text = correction_engine('synthesis').apply(text)
+
+Scripts outside the repository root put the root on sys.path first.
+"""
+
+from .engine import CorrectionEngine, apply_sequential, literal_rules, trace_sequential
+from .files import load_file
+from .page_cache import PageCache
+from .rules import correction_engine, entries, load_rules, rule_set, ruleset_version
+
+__all__ = [
+    'CorrectionEngine',
+    'PageCache',
+    'apply_sequential',
+    'correction_engine',
+    'entries',
+    'literal_rules',
+    'load_file',
+    'load_rules',
+    'rule_set',
+    'ruleset_version',
+    'trace_sequential',
+]
@@ -0,0 +1,423 @@
+"""
+Single-pass text corrections for the cleanup scripts
+
+The cleanup scripts fix OCR errors with long ordered lists of
+substitutions (the rule sets in rules.json). Applied the plain way, each
+entry is its own pass over the whole book: a str.replace() or re.sub()
+per fix.
+
+CorrectionEngine compiles such a list once into as few passes as it can
+without changing the result. Consecutive rules are fused into one pass
+as long as no rule in the pass can see another's edits. For word-for-word
+fixes that is checked on the strings themselves: the text a rule looks
+for must not overlap the text an earlier rule looks for or writes. For
+general patterns it is checked on the characters each can read (match
+and lookarounds) and write. Rules that delete text, can match the empty
+string, use groups or read any character get a pass of their own, so
+the output is always what applying the rules one by one gives.
+
+Python's re has no Aho-Corasick matcher, so a fused pass of literal
+fixes is either str.replace() per fix, when nothing around the text
+matters, or one alternation of the literals with the replacement looked
+up by the text matched. Other fused passes are an alternation with a
+named group per rule. Regex passes are skipped when none of their rules
+can match, judged by a literal every match must contain, and a leading
+\\b is moved behind the literal after it so re can search for that
+literal instead of trying every position.
+"""
+
+import re
+from functools import lru_cache
+
+try:
+    from re import _parser as sre_parse      # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Scoped inline flags a fused rule keeps
+INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'))
+SUPPORTED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+
+LINE_ANCHORS = {sre_parse.AT_BEGINNING, sre_parse.AT_END, sre_parse.AT_BEGINNING_STRING,
+                sre_parse.AT_END_STRING, sre_parse.AT_BEGINNING_LINE, sre_parse.AT_END_LINE}
+WORD_BOUNDARIES = {sre_parse.AT_BOUNDARY, sre_parse.AT_NON_BOUNDARY}
+
+WORD_CHAR = re.compile(r'\w')
+
+# Widest character class spelled out character by character
+MAX_CLASS_CHARS = 256
+
+
+@lru_cache(maxsize=None)
+def whitespace() -> frozenset:
+    """Every character \\s matches."""
+    return frozenset(chr(i) for i in range(0x110000) if chr(i).isspace())
+
+
+class Unanalyzable(Exception):
+    """The pattern uses something the fusion check does not model."""
+
+
+def _class_chars(items) -> set:
+    chars = set()
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            chars.add(chr(av))
+        elif op == sre_parse.RANGE:
+            lo, hi = av
+            if hi - lo > MAX_CLASS_CHARS:
+                raise Unanalyzable('wide range')
+            chars.update(chr(c) for c in range(lo, hi + 1))
+        elif op == sre_parse.CATEGORY and av == sre_parse.CATEGORY_SPACE:
+            chars.update(whitespace())
+        else:
+            raise Unanalyzable(f'class item {op}')
+    return chars
+
+
+def _walk(items, info: dict):
+    """Collect the characters a parsed pattern can read, and its assertions."""
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            info['reads'].add(chr(av))
+        elif op == sre_parse.IN:
+            info['reads'].update(_class_chars(av))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            _walk(av[2], info)
+        elif op == sre_parse.SUBPATTERN:
+            _walk(av[-1], info)
+        elif op == sre_parse.BRANCH:
+            for branch in av[1]:
+                _walk(branch, info)
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            _walk(av[1], info)
+        elif op == sre_parse.AT and av in WORD_BOUNDARIES:
+            info['boundary'] = True
+        elif op == sre_parse.AT and av in LINE_ANCHORS:
+            info['line_anchor'] = True
+        else:
+            raise Unanalyzable(f'op {op}')
+
+
+def _required(items):
+    """The longest run of literal characters every match must contain."""
+    best = run = ''
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            run += chr(av)
+            best = max(best, run, key=len)
+        else:
+            run = ''
+    return best or None
+
+
+def _shape(value):
+    """A parsed pattern as nested tuples, so two parses can be compared."""
+    if isinstance(value, (sre_parse.SubPattern, list, tuple)):
+        return tuple(_shape(item) for item in value)
+    return value
+
+
+def literal_first(pattern: str, parsed, flags: int) -> str:
+    """`pattern` with a leading \\b moved behind the literal text after it.
+
+    re skips ahead to a pattern's literal prefix with a fast string
+    search, but tries a pattern that starts with \\b at every position.
+    \\bWord and Word(?<!\\w[\\s\\S]{4}) match the same text, and the
+    second has a prefix. Patterns where the rewrite does not parse back
+    to the same thing are returned unchanged.
+    """
+    items = list(parsed)
+    if flags & re.IGNORECASE:
+        return pattern  # re searches for no prefix of cased letters here anyway
+    if not pattern.startswith('\\b') or items[:1] != [(sre_parse.AT, sre_parse.AT_BOUNDARY)]:
+        return pattern
+    run = 0
+    while 1 + run < len(items) and items[1 + run][0] == sre_parse.LITERAL:
+        run += 1
+    if not run:
+        return pattern
+    text = ''.join(chr(av) for _, av in items[1:1 + run])
+    source = pattern[2:]
+    for end in range(1, len(source) + 1):
+        try:
+            head = list(sre_parse.parse(source[:end], flags))
+        except re.error:
+            continue
+        if head == items[1:1 + run]:
+            break
+    else:
+        return pattern
+    rest = source[end:]
+    try:
+        if _shape(sre_parse.parse(rest, flags)) != _shape(items[1 + run:]):
+            return pattern
+    except re.error:
+        return pattern
+    side = '!' if word_class(text[0]) else '='
+    return f'{re.escape(text)}(?<{side}\\w[\\s\\S]{{{len(text)}}}){rest}'
+
+
+def _literal(items):
+    """The literal text of a pattern that is only literals, maybe between \\b's."""
+    items = list(items)
+    if items and items[0] == (sre_parse.AT, sre_parse.AT_BOUNDARY):
+        items = items[1:]
+    if items and items[-1] == (sre_parse.AT, sre_parse.AT_BOUNDARY):
+        items = items[:-1]
+    if items and all(op == sre_parse.LITERAL for op, _ in items):
+        return ''.join(chr(av) for _, av in items)
+    return None
+
+
+class Rule:
+    """One substitution, with what the fusion check needs to know about it."""
+
+    def __init__(self, pattern: str, replacement: str, flags: int = 0):
+        self.pattern = pattern
+        self.replacement = replacement
+        self.flags = flags
+        self.fusible = False
+        self.literal = None
+        self.required = None
+        self.reads = set()
+        self.boundary = False
+        self.line_anchor = False
+
+        parsed = sre_parse.parse(pattern, flags)
+        self.search = literal_first(pattern, parsed, flags)
+        self.regex = re.compile(self.search, flags)
+        if not flags & re.IGNORECASE:
+            self.required = _required(parsed)
+        if flags & ~SUPPORTED_FLAGS or '\\' in replacement or self.regex.groups:
+            return
+        if parsed.getwidth()[0] == 0:
+            return
+        info = {'reads': set(), 'boundary': False, 'line_anchor': False}
+        try:
+            _walk(parsed, info)
+        except Unanalyzable:
+            return
+        self.fusible = True
+        self.literal = _literal(parsed)
+        self.reads = info['reads']
+        self.boundary = info['boundary']
+        self.line_anchor = info['line_anchor']
+
+    @property
+    def ignorecase(self) -> bool:
+        return bool(self.flags & re.IGNORECASE)
+
+    def could_match(self, text: str) -> bool:
+        """False only if the rule cannot match `text`: its required literal is missing."""
+        return self.required is None or self.required in text
+
+    def scoped(self) -> str:
+        letters = ''.join(letter for flag, letter in INLINE_FLAGS if self.flags & flag)
+        return f'(?{letters}:{self.search})' if letters else f'(?:{self.search})'
+
+    def grouped(self, name: str) -> str:
+        return f'(?P<{name}>{self.scoped()})'
+
+    def may_create(self, literal: str) -> bool:
+        """Whether a replacement by this rule can make `literal` appear where it was not."""
+        if not self.replacement or '\\' in self.replacement:
+            return True
+        return overlaps(self.replacement, literal)
+
+
+def overlaps(a: str, b: str) -> bool:
+    """Whether an occurrence of `a` and one of `b` can share characters."""
+    if a in b or b in a:
+        return True
+    return any(a[-k:] == b[:k] or b[-k:] == a[:k] for k in range(1, min(len(a), len(b))))
+
+
+def word_class(char: str) -> bool:
+    return bool(WORD_CHAR.match(char))
+
+
+def folded(chars) -> set:
+    return {c for char in chars for c in (char.lower(), char.upper(), char.casefold())}
+
+
+def independent(earlier: Rule, later: Rule) -> bool:
+    """Whether `later` sees the same matches whether or not `earlier` ran first.
+
+    If so, and their matches cannot overlap, one alternation pass with
+    both rules gives the same text as two passes in order.
+    """
+    if not (earlier.fusible and later.fusible) or not earlier.replacement:
+        return False
+    written = earlier.replacement
+
+    if earlier.literal is not None and later.literal is not None:
+        looked_for, found, target = earlier.literal, written, later.literal
+        if earlier.ignorecase or later.ignorecase:
+            looked_for, found, target = looked_for.casefold(), found.casefold(), target.casefold()
+        if overlaps(looked_for, target) or overlaps(found, target):
+            return False
+        if later.boundary:
+            # \b next to an edited word still sees the same kind of character
+            return (word_class(earlier.literal[0]) == word_class(written[0])
+                    and word_class(earlier.literal[-1]) == word_class(written[-1]))
+        return True
+
+    touched = earlier.reads | set(written)
+    reads = later.reads
+    if earlier.ignorecase or later.ignorecase:
+        touched, reads = folded(touched), folded(reads)
+    if touched & reads:
+        return False
+    if later.boundary and len({word_class(char) for char in touched}) > 1:
+        return False
+    if later.line_anchor and '\n' in touched:
+        return False
+    return True
+
+
+class Pass:
+    """One scan of the text applying one rule, or several fused rules.
+
+    A pass of literal fixes is a plain alternation and looks the
+    replacement up by the text matched: re finds a match much faster
+    when the branches carry no groups. Other fused passes name a group
+    per rule and look the replacement up by group name.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self.creates = []
+        self.replacement = None
+        self.table = None
+        self.plain = None
+        if all(rule.literal is not None and not rule.boundary and not rule.ignorecase for rule in rules):
+            # Nothing around the text matters: str.replace() does the same, faster
+            self.plain = [(rule.literal, rule.replacement) for rule in rules]
+        elif len(rules) == 1:
+            self.regex = rules[0].regex
+            self.replacement = rules[0].replacement
+        elif all(rule.literal is not None for rule in rules):
+            self.regex = re.compile('|'.join(rule.scoped() for rule in rules))
+            self.table = {rule.literal: rule.replacement for rule in rules if not rule.ignorecase}
+            self.folded = [rule for rule in rules if rule.ignorecase]
+        else:
+            self.names = {f'r{i}': rule.replacement for i, rule in enumerate(rules)}
+            self.regex = re.compile('|'.join(rule.grouped(f'r{i}') for i, rule in enumerate(rules)))
+
+    def by_text(self, match) -> str:
+        found = match.group()
+        if found in self.table:
+            return self.table[found]
+        # Only one rule of the pass can match here; ask the case-insensitive ones
+        for rule in self.folded:
+            other = rule.regex.match(match.string, match.start())
+            if other and other.end() == match.end():
+                return rule.replacement
+        raise AssertionError(f'no rule for {found!r}')
+
+    def __call__(self, text: str) -> str:
+        if self.plain is not None:
+            for old, new in self.plain:
+                text = text.replace(old, new)
+            return text
+        if self.replacement is not None:
+            return self.regex.sub(self.replacement, text)
+        if self.table is not None:
+            return self.regex.sub(self.by_text, text)
+        names = self.names
+        return self.regex.sub(lambda match: names[match.lastgroup], text)
+
+
+def compile_passes(rules: list) -> list:
+    """Group consecutive independent rules into fused passes, keeping rule order."""
+    passes = []
+    group = []
+    for rule in rules:
+        if group and all(independent(earlier, rule) for earlier in group):
+            group.append(rule)
+        else:
+            if group:
+                passes.append(group)
+            group = [rule]
+    if group:
+        passes.append(group)
+
+    compiled = []
+    for group in passes:
+        try:
+            compiled.append(Pass(group))
+        except re.error:
+            # A pattern that cannot be nested in a group (global inline flags)
+            compiled.extend(Pass([rule]) for rule in group)
+    return compiled
+
+
+def literal_rules(replacements) -> list:
+    """(pattern, replacement, flags) rules doing what str.replace() does, in order.
+
+    `replacements` is a dict or a sequence of (old, new) pairs.
+    """
+    pairs = replacements.items() if isinstance(replacements, dict) else replacements
+    return [(re.escape(old), new.replace('\\', r'\\'), 0) for old, new in pairs if old != new]
+
+
+def apply_sequential(rules: list, text: str) -> str:
+    """The rules applied one re.sub() at a time; the reference output."""
+    for pattern, replacement, flags in rules:
+        text = re.sub(pattern, replacement, text, flags=flags)
+    return text
+
+
+def trace_sequential(rules: list, text: str) -> list:
+    """The texts apply_sequential() goes through: (index, text) after each rule that changed it."""
+    steps = []
+    for i, (pattern, replacement, flags) in enumerate(rules):
+        corrected = re.sub(pattern, replacement, text, flags=flags)
+        if corrected != text:
+            steps.append((i, corrected))
+            text = corrected
+    return steps
+
+
+class CorrectionEngine:
+    """An ordered list of (pattern, replacement, flags) rules, compiled once.
+
+    apply(text) returns what applying the rules one re.sub() at a time
+    would, in as few passes over the text as the rules allow. Regex
+    passes whose rules cannot match are skipped: a rule's required
+    literal is looked up once with str's `in`, and looked up again only
+    after a pass whose replacements could have written it. Passes of
+    plain literals always run; str.replace() costs no more than the
+    lookup would.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = [Rule(pattern, replacement, flags) for pattern, replacement, flags in rules]
+        self.passes = compile_passes(self.rules)
+        regex_rules = [rule for correction in self.passes if correction.plain is None
+                       for rule in correction.rules]
+        self.unscreened = {rule for rule in regex_rules if rule.required is None}
+        self.screened = [rule for rule in regex_rules if rule.required is not None]
+        later = list(self.screened)
+        for correction in self.passes:
+            if correction.plain is None:
+                del later[:sum(1 for rule in correction.rules if rule.required is not None)]
+            correction.creates = [rule for rule in later
+                                  if any(writer.may_create(rule.required) for writer in correction.rules)]
+
+    def __len__(self):
+        return len(self.passes)
+
+    def apply(self, text: str) -> str:
+        possible = self.unscreened | {rule for rule in self.screened if rule.could_match(text)}
+        for correction in self.passes:
+            if correction.plain is None and not any(rule in possible for rule in correction.rules):
+                continue
+            corrected = correction(text)
+            if corrected == text:
+                continue
+            text = corrected
+            possible.update(rule for rule in correction.creates
+                            if rule not in possible and rule.could_match(text))
+        return text
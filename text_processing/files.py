@@ -0,0 +1,21 @@
+"""
+Reading the book's text files
+
+Sources come from several tools and machines, so some are not UTF-8.
+"""
+
+# Tried in order; latin-1 decodes any bytes, so later entries are a last resort
+ENCODINGS = ('utf-8', 'latin-1', 'cp1252')
+
+
+def load_file(filepath, encodings=ENCODINGS):
+    """File content with encoding fallback, or None if it cannot be read."""
+    for encoding in encodings:
+        try:
+            with open(filepath, 'r', encoding=encoding) as f:
+                return f.read()
+        except UnicodeDecodeError:
+            continue
+        except OSError:
+            return None
+    return None
@@ -0,0 +1,164 @@
+"""
+Classifying the lines of OCR text in one pass
+
+The cleanup stages drop or blank lines by what they are made of: mostly
+symbols, no letters at all, a bare page number, a running header, a
+chapter title. Rather than each stage scanning every line again with its
+own regexes or per-character loops, classify_lines() maps the whole text
+to one class byte per character with a single bytes.translate(), finds
+the few lines that aren't plain text in that with one compiled regex and
+counts symbols per line with a second translate, so no Python code runs
+per character and little per line. The result is a LineKind per line
+for every stage to use.
+"""
+
+import codecs
+import re
+
+# Symbols the OCR leaves on junk lines (synthesize_final_text's artifact pass)
+ARTIFACT_SYMBOLS = frozenset('-_~=◄►▼▲•♦★☆○●□■△▽◇◆§¶†‡※⁂⁕⁑⁎⁏⁐⁗℗®©™℠℡℮ℯℰℱⅫⅻⅿↀↁↂↃↄↅↆↇↈ')
+
+# Share of letters, digits and spaces below which a line is garbage
+GARBAGE_RATIO = 0.4
+GARBAGE_MIN_LENGTH = 6
+
+
+class LineKind:
+    """Bit flags for what a line is; a line can be several of these at once."""
+    TEXT = 0
+    BLANK = 1            # whitespace only
+    ARTIFACT = 2         # nothing but symbols, at least one of ARTIFACT_SYMBOLS in a run
+    GARBAGE = 4          # under GARBAGE_RATIO letters, digits and spaces
+    NO_LETTERS = 8       # no ASCII letter
+    SYMBOL_START = 16    # starts with three symbols
+    STRAY_LETTER = 32    # one lowercase letter on its own
+    PAGE_NUMBER = 64     # digits only
+    HEADER = 128         # a running header
+    CHAPTER = 256        # opens with a chapter title
+
+
+def char_class(char: str) -> str:
+    """A character's class letter.
+
+    l/u  ASCII lower/upper case letter    d  digit
+    a    other letter or number           A  one that is an artifact symbol
+    _    underscore                       s  other artifact symbol
+    #    any other symbol                 ' ' whitespace but newline
+    """
+    if char == '\n':
+        return '\n'
+    if char.isspace():
+        return ' '
+    if 'a' <= char <= 'z':
+        return 'l'
+    if 'A' <= char <= 'Z':
+        return 'u'
+    if char.isdigit():
+        return 'd'
+    if char.isalnum():
+        return 'A' if char in ARTIFACT_SYMBOLS else 'a'
+    if char == '_':
+        return '_'
+    return 's' if char in ARTIFACT_SYMBOLS else '#'
+
+
+# The byte non-ASCII characters are encoded as, by class, for CLASSES to translate
+NON_ASCII = {kind: 0x80 + i for i, kind in enumerate('aAs# d')}
+
+
+class _NonAscii(dict):
+    """The byte for each non-ASCII character, filled in as met."""
+
+    def __missing__(self, char: str) -> int:
+        self[char] = code = NON_ASCII[char_class(char)]
+        return code
+
+
+_NON_ASCII = _NonAscii()
+
+
+def _encode_classes(error: UnicodeEncodeError):
+    """Encoding error handler: non-ASCII characters become their NON_ASCII byte."""
+    return bytes(_NON_ASCII[char] for char in error.object[error.start:error.end]), error.end
+
+
+codecs.register_error('line-classes', _encode_classes)
+
+# bytes.translate() table from ASCII and the NON_ASCII bytes to class bytes
+_CLASS_OF = {code: char_class(chr(code)) for code in range(128)}
+_CLASS_OF.update({code: kind for kind, code in NON_ASCII.items()})
+CLASSES = ''.join(_CLASS_OF.get(code, '#') for code in range(256)).encode('ascii')
+
+
+def classes_of(text: str) -> bytes:
+    """One class byte (see char_class()) per character of text."""
+    return text.encode('ascii', 'line-classes').translate(CLASSES)
+
+
+# What each line of class bytes is, one regex per kind
+LINE_KINDS = [
+    (LineKind.BLANK, re.compile(rb' *')),
+    (LineKind.ARTIFACT, re.compile(rb'[s#]*[sA_]+[s#]*')),
+    (LineKind.NO_LETTERS, re.compile(rb'[^lu]*')),
+    (LineKind.SYMBOL_START, re.compile(rb'[s#]{3}.*')),
+    (LineKind.STRAY_LETTER, re.compile(rb'l *')),
+    (LineKind.PAGE_NUMBER, re.compile(rb' *d+ *')),
+]
+# The lines any of those can match, in class bytes with a newline either side. The
+# leading newline lets the regex engine skip from line to line instead of trying
+# a ^ at every character.
+ODD_LINES = re.compile(rb'\n(?=[^lu\n]*\n|[s#]{3}|l *\n)([^\n]*)')
+
+
+class _LineKinds(dict):
+    """The LineKind of each line of class bytes, bar GARBAGE, filled in as met."""
+
+    def __missing__(self, line: bytes) -> int:
+        self[line] = kinds = sum(kind for kind, regex in LINE_KINDS if regex.fullmatch(line))
+        return kinds
+
+
+# Odd lines are mostly blank, a page number or a few symbols, so most recur
+_LINE_KINDS = _LineKinds()
+
+
+def matching_lines(regex, text: str):
+    """The number of each line a MULTILINE regex matches in, by where the match starts."""
+    line = 0
+    pos = 0
+    for match in regex.finditer(text):
+        line += text.count('\n', pos, match.start())
+        pos = match.start()
+        yield line
+
+
+def classify_lines(text: str, headers=frozenset(), chapters=None) -> list:
+    """A LineKind for each line of text.split('\\n').
+
+    `headers` are running header lines, compared stripped; `chapters` is
+    a MULTILINE regex matching at the start of a chapter's opening line.
+    """
+    classes = classes_of(text)
+    kinds = [LineKind.TEXT] * (classes.count(b'\n') + 1)
+    wrapped = b'\n' + classes + b'\n'
+    i = 0
+    pos = 0
+    for match in ODD_LINES.finditer(wrapped):
+        i += wrapped.count(b'\n', pos, match.start())
+        pos = match.start()
+        kinds[i] = _LINE_KINDS[match.group(1)]
+    # Dropping letters, digits and spaces leaves each line's symbols; under four never make garbage
+    lines = classes.split(b'\n')
+    for i, symbols in enumerate(classes.translate(None, b'ludaA ').split(b'\n')):
+        if len(symbols) > 3:
+            length = len(lines[i])
+            if length >= GARBAGE_MIN_LENGTH and (length - len(symbols)) / length < GARBAGE_RATIO:
+                kinds[i] |= LineKind.GARBAGE
+    if headers:
+        for i, line in enumerate(text.split('\n')):
+            if line.strip() in headers:
+                kinds[i] |= LineKind.HEADER
+    if chapters is not None:
+        for i in matching_lines(chapters, text):
+            kinds[i] |= LineKind.CHAPTER
+    return kinds
@@ -0,0 +1,119 @@
+"""
+Corrected pages from earlier runs, reused while the rules still give them
+
+A script corrects its text a page at a time through PageCache.lookup().
+Each page is stored under a hash of its text, with the rule set version
+it was corrected under and the text after every rule that changed it.
+When rules.json changes, only the edited stretches of the rule list are
+run again, on the stored text at that point: if they leave it as the
+old rules did, the page is reused, otherwise it is corrected again. So
+editing one rule recomputes just the pages that rule matches, and
+editing one page recomputes just that page.
+
+The cache is pickled under CACHE_DIR (.cache/ at the repository root,
+or a script's --cache-dir) and holds the pages of the last run only, so it does not grow as the text is edited.
+"""
+
+import os
+import pickle
+import hashlib
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from .engine import apply_sequential, trace_sequential
+from .rules import CACHE_DIR, RULES_FILE, rule_set, ruleset_version
+
+
+class PageCache:
+    """A pipeline's corrected pages by content, loaded from and saved to one pickle file.
+
+    `salt` is mixed into every page hash: the source of whatever else
+    decides a page's result, so changing that code starts afresh.
+    """
+
+    def __init__(self, pipeline: str, salt: bytes = b'', path=RULES_FILE, cache_dir=CACHE_DIR):
+        self.rules = rule_set(pipeline, path)
+        self.version = ruleset_version(path)
+        self.path = Path(cache_dir) / f"pages-{pipeline}.pickle"
+        self.salt = salt
+        self.used = {}
+        self.edits = {}
+        self.reused = 0
+        self.corrected = 0
+        try:
+            with open(self.path, 'rb') as f:
+                stored = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            stored = {'rules': {}, 'pages': {}}
+        self.stored_rules = stored['rules']
+        self.stored = stored['pages']
+
+    def key(self, page: str) -> str:
+        return hashlib.sha256(self.salt + page.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def lookup(self, page: str, prepare, finish):
+        """finish(corrected text) for a page, reused when the rules allow.
+
+        prepare(page) gives the text the rules are applied to.
+        """
+        key = self.key(page)
+        entry = self.used.get(key) or self.stored.get(key)
+        if entry is not None and self.unchanged(entry):
+            self.reused += 1
+        else:
+            text = prepare(page)
+            steps = trace_sequential(self.rules, text)
+            corrected = steps[-1][1] if steps else text
+            entry = {'version': self.version, 'text': text, 'steps': steps, 'result': finish(corrected)}
+            self.corrected += 1
+        self.used[key] = entry
+        return entry['result']
+
+    def unchanged(self, entry: dict) -> bool:
+        """Whether the current rules give the same text as those the entry was corrected with."""
+        if entry['version'] == self.version:
+            return True
+        edits = self.edits_since(entry['version'])
+        if edits is None:
+            return False
+        # Up to each edit both lists have given the same text, so each edit is checked on its own
+        for i1, i2, j1, j2 in edits:
+            if apply_sequential(self.rules[j1:j2], text_before(entry, i1)) != text_before(entry, i2):
+                return False
+        return True
+
+    def edits_since(self, version: str):
+        """(i1, i2, j1, j2) for each stretch old_rules[i1:i2] that became rules[j1:j2]."""
+        if version not in self.edits:
+            old_rules = self.stored_rules.get(version)
+            if old_rules is None:
+                self.edits[version] = None
+            else:
+                matcher = SequenceMatcher(None, old_rules, self.rules, autojunk=False)
+                self.edits[version] = [(i1, i2, j1, j2) for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+                                       if tag != 'equal']
+        return self.edits[version]
+
+    def save(self):
+        """Write the pages used since loading, and the rule lists they were corrected with."""
+        versions = {entry['version'] for entry in self.used.values()}
+        known = dict(self.stored_rules, **{self.version: self.rules})
+        stored = {'rules': {version: known[version] for version in versions}, 'pages': self.used}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(stored, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # a read-only checkout still works, it just recomputes every run
+
+
+def text_before(entry: dict, index: int) -> str:
+    """An entry's text just before rule `index` of the rules it was corrected with."""
+    text = entry['text']
+    for i, step in entry['steps']:
+        if i >= index:
+            break
+        text = step
+    return text
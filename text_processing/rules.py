@@ -0,0 +1,112 @@
+"""
+The shared correction-rule store
+
+rules.json holds every cleanup script's correction tables as named rule
+sets, each a list of noted groups of [pattern, replacement] entries
+(optionally with a third note), and pipelines: the ordered sets a script
+applies. Regex sets carry their re flags as letters; literal sets are
+plain text, replaced like str.replace().
+
+Nothing is read until a script first asks for a pipeline. Its compiled
+CorrectionEngine is pickled under CACHE_DIR, keyed by the rules file,
+the engine code and the Python version, so later runs load it instead
+of analysing every rule again.
+"""
+
+import os
+import re
+import sys
+import json
+import pickle
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from .engine import CorrectionEngine, literal_rules
+
+RULES_FILE = Path(__file__).with_name('rules.json')
+# Compiled engines and corrected pages, in .cache/ at the repository root (git-ignored)
+CACHE_DIR = Path(__file__).resolve().parents[1] / '.cache'
+ENGINE_SOURCE = Path(__file__).with_name('engine.py')
+
+FLAG_LETTERS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL, 'x': re.VERBOSE}
+
+
+def parse_flags(letters: str) -> int:
+    flags = 0
+    for letter in letters:
+        if letter not in FLAG_LETTERS:
+            raise ValueError(f"Unknown rule flag {letter!r}")
+        flags |= FLAG_LETTERS[letter]
+    return flags
+
+
+@lru_cache(maxsize=None)
+def _read(path: Path) -> bytes:
+    return path.read_bytes()
+
+
+def load_rules(path=RULES_FILE) -> dict:
+    """The rules file as a dict."""
+    return json.loads(_read(Path(path)))
+
+
+def ruleset_version(path=RULES_FILE) -> str:
+    """The file's declared version plus a digest of its content, e.g. '1.3f2a9c0d1e2b'.
+
+    Any edit to a rule changes it, whether or not the version was bumped.
+    """
+    digest = hashlib.sha256(_read(Path(path))).hexdigest()[:12]
+    return f"{load_rules(path)['version']}.{digest}"
+
+
+def entries(name: str, path=RULES_FILE) -> list:
+    """A rule set's (pattern, replacement) pairs, in order, as written."""
+    rule_set = load_rules(path)['sets'][name]
+    return [(rule[0], rule[1]) for group in rule_set['groups'] for rule in group['rules']]
+
+
+def pipeline_sets(pipeline: str, path=RULES_FILE) -> list:
+    return load_rules(path)['pipelines'][pipeline]
+
+
+def rule_set(pipeline: str, path=RULES_FILE) -> list:
+    """A pipeline's (pattern, replacement, flags) rules, for CorrectionEngine."""
+    rules = []
+    sets = load_rules(path)['sets']
+    for name in pipeline_sets(pipeline, path):
+        if sets[name].get('literal'):
+            rules.extend(literal_rules(entries(name, path)))
+        else:
+            flags = parse_flags(sets[name].get('flags', ''))
+            rules.extend((pattern, replacement, flags) for pattern, replacement in entries(name, path))
+    return rules
+
+
+def cache_path(pipeline: str, path=RULES_FILE) -> Path:
+    key = hashlib.sha256()
+    for part in (_read(Path(path)), _read(ENGINE_SOURCE), sys.version.encode(), pipeline.encode()):
+        key.update(part)
+    return CACHE_DIR / f"rules-{pipeline}-{key.hexdigest()[:16]}.pickle"
+
+
+@lru_cache(maxsize=None)
+def correction_engine(pipeline: str, path=RULES_FILE) -> CorrectionEngine:
+    """A pipeline's compiled engine: from this process, the disk cache, or built."""
+    cached = cache_path(pipeline, path)
+    try:
+        with open(cached, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        pass
+
+    engine = CorrectionEngine(rule_set(pipeline, path))
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(engine, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cached)
+    except OSError:
+        pass  # a read-only checkout still works, it just compiles every run
+    return engine
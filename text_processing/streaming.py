@@ -0,0 +1,60 @@
+"""
+Text transformations over a stream of chunks
+
+Each stage takes an iterable of text chunks and yields text chunks, and
+''.join() of its output is what the whole-string version returns on
+''.join() of its input. Only a small window of text is held at a time.
+"""
+
+import re
+
+# Characters a streamed substitution holds back: longer than any match and its lookarounds
+WINDOW = 4096
+
+
+def _substitute(regex, replacement: str, buffer: str, start: int, limit: int):
+    """Substitute matches starting in buffer[start:limit]; (text, position it ends at)."""
+    parts = []
+    pos = start
+    for match in regex.finditer(buffer, start):
+        if match.start() >= limit:
+            break
+        parts.append(buffer[pos:match.start()])
+        parts.append(match.expand(replacement))
+        pos = match.end()
+    cut = max(pos, limit)
+    parts.append(buffer[pos:cut])
+    return ''.join(parts), cut
+
+
+def substituted(chunks, pattern, replacement: str, flags: int = 0, window: int = WINDOW):
+    """re.sub() over a stream of chunks.
+
+    Text is only substituted once `window` more characters have arrived
+    after it, and the `window` characters before the resume point stay
+    as context for lookbehinds and \\b, so the output matches re.sub() on
+    the whole text as long as no match reaches further than `window`.
+    """
+    regex = re.compile(pattern, flags)
+    buffer = ''
+    start = 0
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) - start < 2 * window:
+            continue
+        text, cut = _substitute(regex, replacement, buffer, start, len(buffer) - window)
+        yield text
+        keep = max(0, cut - window)
+        buffer, start = buffer[keep:], cut - keep
+    text, _ = _substitute(regex, replacement, buffer, start, len(buffer) + 1)
+    yield text
+
+
+def by_line(chunks, func):
+    """'\\n'.join(func(line) for line in text.split('\\n')) over a stream of chunks."""
+    carry = ''
+    for chunk in chunks:
+        head, newline, carry = (carry + chunk).rpartition('\n')
+        if newline:
+            yield '\n'.join(func(line) for line in head.split('\n')) + '\n'
+    yield func(carry)
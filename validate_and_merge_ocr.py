@@ -14,10 +14,17 @@ Priority sources:
 
 import os
 import re
+import json
+from itertools import chain
 from pathlib import Path
-from difflib import SequenceMatcher
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from ocr_pages import latest_records
+from text_processing import correction_engine
+from text_processing.lines import LineKind, classify_lines
+from text_similarity import ParagraphIndex, similarity
+
 
 # Configuration
 BASE_DIR = Path("/Users/bonganimlambo/Documents/Code Development/Projects/Buddhist-Study-Materials/00-On Attaining Buddhism")
@@ -37,6 +44,38 @@ SOURCES = {
     "tesseract_pages": BASE_DIR / "ocr_output" / "tesseract_pages",
 }
 
+# Merge sources in order of trust; near-ties between readings go to the earlier one
+SOURCE_PRIORITY = ['final_verified', 'true_version', 'audio_transcript', 'surya', 'tesseract']
+
+SOURCE_NAMES = {
+    'final_verified': 'FINAL_VERIFIED',
+    'true_version': 'TRUE_VERSION',
+    'audio_transcript': 'Audio transcript',
+    'surya': 'Surya OCR',
+    'tesseract': 'Tesseract OCR',
+}
+
+# Sources a person has checked: where one sets a chapter's paragraphs, they are
+# kept as they are unless garbled, and readings that dispute them are only reported
+VERIFIED_SOURCES = {'final_verified'}
+
+# A paragraph with a line of these kinds is garbled (see text_processing/lines.py)
+GARBLED_LINES = LineKind.GARBAGE | LineKind.ARTIFACT
+
+# A source's paragraph is a reading of the same passage at this similarity or above
+MIN_ALIGNMENT = 0.6
+
+# ... and when the shorter of the two is at least this share of the longer
+MIN_LENGTH_RATIO = 0.9
+
+# Readings whose agreement is within this of the best count as tied
+AGREEMENT_MARGIN = 0.02
+
+CHAPTER_MARKER = re.compile(r'--- Chapter (\d+)(?:\s*\(Part \d+\))? ---')
+
+# Paragraph indexes over the plain-text sources, shared by every chapter task
+_shared_indexes = {}
+
 # Chapter structure from the book
 CHAPTERS = {
     1: "Attaining Buddhahood in This Lifetime-The Fundamental Purpose of Life and a Source of Hope for Humankind",
@@ -55,45 +94,8 @@ def clean_ocr_artifacts(text: str) -> str:
     text = re.sub(r'^[¢ e pr\.]+.*?$', '', text, flags=re.MULTILINE)
     text = re.sub(r'^Pg Ao Ho.*?$', '', text, flags=re.MULTILINE)
 
-    # Fix common OCR errors
-    replacements = {
-        'Nitran': 'Nichiren',
-        'Nichrn': 'Nichiren',
-        'Nichran': 'Nichiren',
-        'Daysonan': 'Daishonin',
-        'Dayshoning': 'Daishonin',
-        'Daysonin': 'Daishonin',
-        'Daishonan': 'Daishonin',
-        'Buddhahhod': 'Buddhahood',
-        'Btiddhahood': 'Buddhahood',
-        'myoho': 'myoho',
-        'renge': 'renge',
-        'kyol': 'kyo',
-        'Myohorenge': 'Myoho-renge',
-        'Namyoho': 'Nam-myoho',
-        'Nam Yoho': 'Nam-myoho',
-        'Nam Yohorenga': 'Nam-myoho-renge',
-        'Nam-Myoho-Renge-Kyo': 'Nam-myoho-renge-kyo',
-        'Nam-myoho-renge-Kyo': 'Nam-myoho-renge-kyo',
-        '(WND-1': '(WND-1',  # Fix quote references
-        '(wwp-1': '(WND-1',
-        '(WwND-1': '(WND-1',
-        'llohorenge-kyo': 'Myoho-renge-kyo',
-        'th.ough': 'through',
-        'mn<asing': 'unceasing',
-        '1n other': 'In other',
-        'prarti..-e': 'practice',
-        'BudJ.h.l': 'Buddha',
-        'Surr.1': 'Sutra',
-        'lotw': 'Lotus',
-        '\'OUr': 'your',
-        '-.iew': 'view',
-        'J.1i': 'dai',
-        '.shine': 'Daishonin',
-    }
-
-    for old, new in replacements.items():
-        text = text.replace(old, new)
+    # Fix common OCR errors (ocr_replacements in text_processing/rules.json)
+    text = correction_engine('merge').apply(text)
 
     # Remove garbled symbols
     text = re.sub(r'[�ᥥ]+', '', text)
@@ -121,8 +123,7 @@ def load_verified_text(filepath: Path) -> dict:
     result = {'full': content}
 
     # Extract individual chapters
-    chapter_pattern = r'--- Chapter (\d+)(?:\s*\(Part \d+\))? ---'
-    parts = re.split(chapter_pattern, content)
+    parts = CHAPTER_MARKER.split(content)
 
     if len(parts) > 1:
         # parts will be: [before_ch1, '1', ch1_content, '2', ch2_content, ...]
@@ -189,6 +190,12 @@ def load_surya_output(output_dir: Path) -> str:
     """Load the latest Surya OCR output."""
     import glob
 
+    # Page records from ocr_book.py carry the page texts without banners
+    records = latest_records(output_dir, 'surya')
+    if records is not None:
+        print(f"Loading Surya page records: {records.path}")
+        return clean_ocr_artifacts(records.text())
+
     pattern = str(output_dir / "ocr_surya_*.txt")
     files = glob.glob(pattern)
 
@@ -208,6 +215,11 @@ def load_surya_output(output_dir: Path) -> str:
 
 def load_tesseract_pages(pages_dir: Path) -> str:
     """Load and concatenate Tesseract page outputs."""
+    records = latest_records(pages_dir.parent, 'tesseract')
+    if records is not None:
+        print(f"Loading Tesseract page records: {records.path}")
+        return clean_ocr_artifacts(records.text())
+
     if not pages_dir.exists():
         print(f"Warning: Tesseract pages not found: {pages_dir}")
         return ""
@@ -224,30 +236,290 @@ def load_tesseract_pages(pages_dir: Path) -> str:
 
 def similarity_score(text1: str, text2: str) -> float:
     """Calculate similarity between two texts."""
-    return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+    return similarity(text1.lower(), text2.lower())
 
 
-def find_best_paragraph(target: str, sources: list) -> str:
-    """Find the best matching paragraph from multiple sources."""
-    best_match = target
+def split_paragraphs(text: str) -> list:
+    """Non-empty paragraphs, split at blank lines."""
+    return [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+
+
+def paragraph_spans(text: str) -> list:
+    """(start, end) in `text` of each paragraph split_paragraphs() gives."""
+    spans = []
+    start = 0
+    for gap in chain(re.finditer(r'\n\s*\n', text), [None]):
+        end = gap.start() if gap else len(text)
+        piece = text[start:end]
+        if piece.strip():
+            spans.append((start + len(piece) - len(piece.lstrip()), start + len(piece.rstrip())))
+        if gap:
+            start = gap.end()
+    return spans
+
+
+def best_paragraph_match(target: str, sources) -> tuple:
+    """(best matching paragraph or None, its similarity score).
+
+    `sources` is a list of paragraphs, or a ParagraphIndex built once over
+    them; with an index only its top candidates are scored.
+    """
+    best_match = None
     best_score = 0
 
+    if isinstance(sources, ParagraphIndex):
+        sources = [sources.paragraphs[i] for i in sources.candidates(target)]
+
     for source in sources:
         score = similarity_score(target, source)
         if score > best_score:
             best_score = score
             best_match = source
 
-    return best_match
+    return best_match, best_score
 
 
-def create_comprehensive_text(sources: dict, output_path: Path):
+def find_best_paragraph(target: str, sources) -> str:
+    """Find the best matching paragraph from multiple sources."""
+    best_match, _ = best_paragraph_match(target, sources)
+    return best_match if best_match is not None else target
+
+
+def agreements(readings: dict) -> dict:
+    """Each reading's mean similarity to the other readings of the passage."""
+    names = list(readings)
+    if len(names) == 1:
+        return {names[0]: 1.0}
+
+    pair_scores = {}
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            pair_scores[a, b] = pair_scores[b, a] = similarity_score(readings[a], readings[b])
+    return {name: sum(pair_scores[name, other] for other in names if other != name) / (len(names) - 1)
+            for name in names}
+
+
+def choose_reading(readings: dict) -> tuple:
+    """Pick one reading of a passage: (source, text, agreement).
+
+    `readings` maps source name to that source's text of the passage, in
+    priority order. A reading's agreement is its mean similarity to the
+    other readings; the best-supported reading wins and near-ties go to
+    the higher-priority source.
+    """
+    agreement = agreements(readings)
+    best = max(agreement.values())
+    for name in readings:
+        if agreement[name] >= best - AGREEMENT_MARGIN:
+            return name, readings[name], agreement[name]
+
+
+def garbled(paragraph: str) -> bool:
+    return any(kind & GARBLED_LINES for kind in classify_lines(paragraph))
+
+
+def unreadable(paragraph: str) -> bool:
+    """Whether a paragraph is nothing but OCR artifact lines."""
+    return all(kind & (LineKind.ARTIFACT | LineKind.BLANK) for kind in classify_lines(paragraph))
+
+
+def verified_reading(paragraph: str, primary: str, readings: dict) -> tuple:
+    """What a verified primary paragraph becomes: (source, text or None, agreement).
+
+    It is kept, unless garbled: then the other sources' agreed reading
+    replaces it, or with none it is dropped (text None) if there is
+    nothing in it to read.
+    """
+    if garbled(paragraph):
+        others = {name: text for name, text in readings.items() if name != primary}
+        if others:
+            return choose_reading(others)
+        if unreadable(paragraph):
+            return None, None, 0.0
+    return primary, paragraph, agreements(readings)[primary]
+
+
+def aligned_reading(paragraph: str, primary: ParagraphIndex, index: ParagraphIndex) -> tuple:
+    """Another source's reading of a primary paragraph: (text or None, score).
+
+    The best match in `index` is a reading only if it scores MIN_ALIGNMENT,
+    is of comparable length, and has `paragraph` as its own best match
+    among the primary paragraphs. A fragment of a longer paragraph, or a
+    paragraph its neighbours match as well, is no reading of it.
+    """
+    match, score = best_paragraph_match(paragraph, index)
+    if match is None or score < MIN_ALIGNMENT:
+        return None, score
+    if min(len(match), len(paragraph)) < MIN_LENGTH_RATIO * max(len(match), len(paragraph)):
+        return None, score
+    back, _ = best_paragraph_match(match, primary)
+    if back != paragraph:
+        return None, score
+    return match, score
+
+
+def share_indexes(indexes: dict):
+    """Make the plain-text sources' paragraph indexes available to merge_chapter()."""
+    _shared_indexes.clear()
+    _shared_indexes.update(indexes)
+
+
+def merge_chapter(task: tuple) -> tuple:
+    """Merge one chapter across sources: (chapter, paragraphs, provenance).
+
+    `task` is (chapter, primary source name, primary paragraphs, {source:
+    paragraphs}) for the chapter-organized sources; the plain-text ones
+    come from share_indexes(). The primary source's paragraphs set the
+    order and every other source offers its aligned_reading() of each.
+    A verified primary's paragraphs go through verified_reading(), and
+    where the readings would vote for another source's text the entry
+    names it as 'disputed'; otherwise the readings vote with
+    choose_reading(). A dropped paragraph is None in the list and has
+    source None. Runs in a worker process.
+    """
+    chapter, primary, spine, others = task
+    indexes = {name: ParagraphIndex(paragraphs) for name, paragraphs in others.items() if paragraphs}
+    indexes.update((name, index) for name, index in _shared_indexes.items() if name != primary)
+    primary_index = ParagraphIndex(spine)
+
+    merged = []
+    provenance = []
+    for number, paragraph in enumerate(spine, 1):
+        found = {primary: paragraph}
+        aligned = {}
+        for name, index in indexes.items():
+            match, score = aligned_reading(paragraph, primary_index, index)
+            if match is not None:
+                found[name] = match
+                aligned[name] = round(score, 3)
+        readings = {name: found[name] for name in SOURCE_PRIORITY if name in found}
+
+        if primary in VERIFIED_SOURCES:
+            source, text, agreement = verified_reading(paragraph, primary, readings)
+        else:
+            source, text, agreement = choose_reading(readings)
+        merged.append(text)
+        entry = {'chapter': chapter, 'paragraph': number, 'source': source,
+                 'agreement': round(agreement, 3), 'aligned': aligned}
+        if source in VERIFIED_SOURCES:
+            voted = choose_reading(readings)[0]
+            if voted != source:
+                entry['disputed'] = voted
+        provenance.append(entry)
+
+    return chapter, merged, provenance
+
+
+def chapter_section(chapter: int, paragraphs: list) -> str:
+    return f"--- Chapter {chapter} ---\n" + '\n\n'.join(p for p in paragraphs if p is not None) + "\n\n"
+
+
+def rebuild_document(document: str, merged: dict) -> str:
+    """`document` with its chapters' paragraphs replaced by the merged ones.
+
+    Everything outside the paragraphs -- text before the first chapter
+    marker, the markers themselves with any "(Part k)", and the spacing
+    -- is kept as it is, bar the gap before a dropped (None) paragraph.
+    Merged chapters the document lacks are put in before the first marker
+    of a later chapter.
+    """
+    pieces = []
+    pos = 0
+    used = {}
+    markers = list(CHAPTER_MARKER.finditer(document))
+    present = {int(marker.group(1)) for marker in markers}
+    missing = sorted(chapter for chapter in merged if chapter not in present)
+    for k, marker in enumerate(markers):
+        chapter = int(marker.group(1))
+        pieces.append(document[pos:marker.start()])
+        while missing and missing[0] < chapter:
+            pieces.append(chapter_section(missing[0], merged[missing.pop(0)]))
+        pieces.append(marker.group())
+        end = markers[k + 1].start() if k + 1 < len(markers) else len(document)
+        section = document[marker.end():end]
+        paragraphs = merged.get(chapter, [])
+        last = 0
+        for start, stop in paragraph_spans(section):
+            i = used.get(chapter, 0)
+            used[chapter] = i + 1
+            paragraph = paragraphs[i] if i < len(paragraphs) else section[start:stop]
+            if paragraph is not None:
+                pieces.append(section[last:start])
+                pieces.append(paragraph)
+            last = stop
+        pieces.append(section[last:])
+        pos = end
+    pieces.append(document[pos:])
+    if missing:
+        pieces.append('\n\n' + ''.join(chapter_section(chapter, merged[chapter]) for chapter in missing))
+    return ''.join(pieces)
+
+
+def merge_sources(loaded: dict, workers: int = None) -> tuple:
+    """Paragraph-level merge of every loaded source: (text, provenance).
+
+    `loaded` maps source name to either a chapter-organized dict from
+    load_verified_text() or a plain text. Chapters come from the
+    chapter-organized sources; each is merged independently, in parallel.
+    Plain-text sources are indexed once and searched whole for every
+    chapter. The text is the highest-priority chapter-organized source's
+    with the merged paragraphs in place of its own.
+    """
+    def organized(name):
+        value = loaded[name]
+        return isinstance(value, dict) and any(isinstance(key, int) for key in value)
+
+    names = [name for name in SOURCE_PRIORITY if name in loaded]
+    chapters = sorted({key for name in names if organized(name) for key in loaded[name] if isinstance(key, int)})
+    if not chapters:
+        return '', []
+
+    plain = {}
+    for name in names:
+        if not organized(name):
+            value = loaded[name]
+            plain[name] = ParagraphIndex(split_paragraphs(value.get('full', '') if isinstance(value, dict) else value))
+
+    tasks = []
+    for chapter in chapters:
+        primary = next(name for name in names if organized(name) and chapter in loaded[name])
+        others = {name: split_paragraphs(loaded[name].get(chapter, '')) for name in names
+                  if organized(name) and name != primary}
+        tasks.append((chapter, primary, split_paragraphs(loaded[primary][chapter]), others))
+
+    if workers == 1:
+        share_indexes(plain)
+        results = list(map(merge_chapter, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=share_indexes, initargs=(plain,)) as pool:
+            results = list(pool.map(merge_chapter, tasks))
+
+    merged = {}
+    provenance = []
+    for chapter, chapter_paragraphs, chapter_provenance in results:
+        merged[chapter] = chapter_paragraphs
+        provenance.extend(chapter_provenance)
+    document = loaded[next(name for name in names if organized(name))]['full']
+    return rebuild_document(document, merged), provenance
+
+
+def create_comprehensive_text(sources: dict, output_path: Path, workers: int = None):
     """Create the comprehensive validated text.
 
     Strategy:
-    1. Use FINAL_VERIFIED as primary source (chapters 1-4 from audio transcripts)
-    2. For chapters 5-7, use cleaned Surya OCR or gemini_full
+    1. Follow FINAL_VERIFIED's chapters and paragraphs (chapters 1-4 from audio
+       transcripts), or TRUE_VERSION's where FINAL_VERIFIED lacks a chapter,
+       keeping everything around them as it is
+    2. For each paragraph, align the other sources' readings. FINAL_VERIFIED's
+       paragraphs are kept unless garbled: those take the reading the other
+       sources agree on, or are dropped if they are only OCR artifacts. An
+       unverified source's paragraphs take the reading the sources agree on
+       most, preferring higher-priority sources on near-ties
     3. Apply OCR artifact cleaning throughout
+
+    Which source each paragraph came from, and which FINAL_VERIFIED
+    paragraphs the other sources dispute, is written next to the output
+    as <output>.provenance.json.
     """
     print("\n" + "="*60)
     print("Creating Comprehensive Validated Text")
@@ -273,9 +545,28 @@ def create_comprehensive_text(sources: dict, output_path: Path):
         chapters_found = [k for k in final_verified.keys() if isinstance(k, int)]
         print(f"  FINAL_VERIFIED chapters: {sorted(chapters_found)}")
 
-    # Use FINAL_VERIFIED as the primary source (cleanest for chapters 1-4)
-    # It contains human-verified audio transcript content
-    validated_text = final_verified.get('full', '')
+    # Merge paragraph by paragraph, one chapter per worker
+    loaded = {'final_verified': final_verified, 'true_version': true_version,
+              'audio_transcript': audio, 'surya': surya, 'tesseract': tesseract}
+    loaded = {name: value for name, value in loaded.items() if value}
+    validated_text, provenance = merge_sources(loaded, workers=workers)
+    if not provenance:
+        validated_text = final_verified.get('full', '')
+
+    wins = {}
+    for entry in provenance:
+        if entry['source'] is not None:
+            wins[entry['source']] = wins.get(entry['source'], 0) + 1
+    print(f"\nParagraphs merged: {len(provenance):,}")
+    for name in SOURCE_PRIORITY:
+        if name in wins:
+            print(f"  {SOURCE_NAMES[name]}: {wins[name]:,}")
+    dropped = sum(1 for entry in provenance if entry['source'] is None)
+    disputed = sum(1 for entry in provenance if 'disputed' in entry)
+    if dropped:
+        print(f"  Dropped as OCR artifacts: {dropped:,}")
+    if disputed:
+        print(f"  Kept though other sources disagree: {disputed:,} (see provenance)")
 
     # Clean the text
     validated_text = clean_ocr_artifacts(validated_text)
@@ -307,11 +598,9 @@ def create_comprehensive_text(sources: dict, output_path: Path):
     output.append("COMPREHENSIVE VALIDATED TEXT")
     output.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     output.append("")
-    output.append("Sources used (in order of priority):")
-    output.append("  1. FINAL_VERIFIED - Audio transcript-based (Chapters 1-4)")
-    output.append("  2. Surya OCR - Layout-optimized OCR output")
-    output.append("  3. TRUE_VERSION - Gemini extraction")
-    output.append("  4. Tesseract OCR - Fallback reference")
+    output.append("Sources used (in order of priority, paragraphs taken from each):")
+    for i, name in enumerate([name for name in SOURCE_PRIORITY if name in loaded], 1):
+        output.append(f"  {i}. {SOURCE_NAMES[name]} - {wins.get(name, 0):,} paragraphs")
     output.append("")
     output.append("This text reads as if reading the actual book.")
     output.append("=" * 70)
@@ -325,14 +614,20 @@ def create_comprehensive_text(sources: dict, output_path: Path):
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(output_text)
 
+    provenance_path = output_path.with_suffix('.provenance.json')
+    with open(provenance_path, 'w', encoding='utf-8') as f:
+        json.dump(provenance, f, indent=1)
+
     print(f"\nValidated text saved to: {output_path}")
+    print(f"Provenance saved to: {provenance_path}")
     print(f"Total characters: {len(output_text):,}")
 
     # Also create a statistics summary
     stats = {
         'total_chars': len(output_text),
         'chapters_from_audio': [1, 2, 3, 4],
-        'sources_used': ['FINAL_VERIFIED', 'Surya OCR', 'TRUE_VERSION'],
+        'sources_used': [SOURCE_NAMES[name] for name in SOURCE_PRIORITY if name in wins],
+        'paragraphs_by_source': wins,
     }
 
     return output_text, stats
@@ -388,6 +683,8 @@ def main():
     parser.add_argument('--output', '-o', type=str,
                         default=str(BASE_DIR / "VALIDATED_COMPREHENSIVE_TEXT.txt"),
                         help='Output file path')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Chapters merged in parallel (default: one per CPU)')
 
     args = parser.parse_args()
 
@@ -395,12 +692,12 @@ def main():
         compare_sources(SOURCES)
 
     if args.merge:
-        create_comprehensive_text(SOURCES, Path(args.output))
+        create_comprehensive_text(SOURCES, Path(args.output), workers=args.workers)
 
     if not args.compare and not args.merge:
         # Default: run both
         compare_sources(SOURCES)
-        create_comprehensive_text(SOURCES, Path(args.output))
+        create_comprehensive_text(SOURCES, Path(args.output), workers=args.workers)
 
 
 if __name__ == '__main__':